@@ -18,6 +18,7 @@ def reload_modules(name):
     '''
 
     import os
+    import sys
     import importlib
 
 
@@ -57,6 +58,11 @@ def reload_modules(name):
                 modules.append((path, module))
 
     for path, module in modules:
+
+        # modules, that haven't been imported yet, like lazily registered pies, don't need reloading
+        if ".".join([__name__] + path + [module]) not in sys.modules:
+            continue
+
         if path:
             impline = "from . %s import %s" % (".".join(path), module)
         else:
@@ -74,10 +80,10 @@ if 'bpy' in locals():
 import bpy
 from bpy.props import PointerProperty, BoolProperty, EnumProperty
 from . properties import M3SceneProperties, M3ObjectProperties
-from . utils.registration import get_core, get_tools, get_pie_menus
+from . utils.registration import get_core, get_tools, get_pie_menus, get_prefs, print_registration_timings
 from . utils.registration import register_classes, unregister_classes, register_keymaps, unregister_keymaps, register_icons, unregister_icons, register_msgbus, unregister_msgbus
 from . ui.menus import object_context_menu, mesh_context_menu, add_object_buttons, material_pick_button, outliner_group_toggles, extrude_menu, group_origin_adjustment_toggle, render_menu, render_buttons
-from . handlers import focus_HUD, surface_slide_HUD, update_group, update_asset, update_msgbus, screencast_HUD, increase_lights_on_render_end, decrease_lights_on_render_start, axes_HUD
+from . handlers import update_msgbus, increase_lights_on_render_end, decrease_lights_on_render_start, dispatch_depsgraph_update, clear_mesh_caches, clear_id_caches
 
 
 def register():
@@ -102,7 +108,7 @@ def register():
     tool_classlists, tool_keylists, tool_count = get_tools()
     pie_classlists, pie_keylists, pie_count = get_pie_menus()
 
-    classes = register_classes(tool_classlists + pie_classlists) + core_classes
+    classes = register_classes(tool_classlists) + register_classes(pie_classlists, lazy=get_prefs().lazy_pie_registration) + core_classes
     keymaps = register_keymaps(tool_keylists + pie_keylists)
 
     bpy.types.VIEW3D_MT_object_context_menu.prepend(object_context_menu)
@@ -133,13 +139,12 @@ def register():
     # HANDLERS
 
     bpy.app.handlers.load_post.append(update_msgbus)
+    bpy.app.handlers.load_post.append(clear_mesh_caches)
+    bpy.app.handlers.load_post.append(clear_id_caches)
+    bpy.app.handlers.undo_post.append(clear_id_caches)
+    bpy.app.handlers.redo_post.append(clear_id_caches)
 
-    bpy.app.handlers.depsgraph_update_post.append(axes_HUD)
-    bpy.app.handlers.depsgraph_update_post.append(focus_HUD)
-    bpy.app.handlers.depsgraph_update_post.append(surface_slide_HUD)
-    bpy.app.handlers.depsgraph_update_post.append(update_group)
-    bpy.app.handlers.depsgraph_update_post.append(update_asset)
-    bpy.app.handlers.depsgraph_update_post.append(screencast_HUD)
+    bpy.app.handlers.depsgraph_update_post.append(dispatch_depsgraph_update)
 
     bpy.app.handlers.render_init.append(decrease_lights_on_render_start)
     bpy.app.handlers.render_cancel.append(increase_lights_on_render_end)
@@ -150,6 +155,9 @@ def register():
 
     print(f"Registered {bl_info['name']} {'.'.join([str(i) for i in bl_info['version']])} with {tool_count} {'tool' if tool_count == 1 else 'tools'}, {pie_count} pie {'menu' if pie_count == 1 else 'menus'}")
 
+    if get_prefs().show_registration_timings:
+        print_registration_timings()
+
 
 def unregister():
     global classes, keymaps, icons, owner
@@ -157,6 +165,10 @@ def unregister():
     # HANDLERS
 
     bpy.app.handlers.load_post.remove(update_msgbus)
+    bpy.app.handlers.load_post.remove(clear_mesh_caches)
+    bpy.app.handlers.load_post.remove(clear_id_caches)
+    bpy.app.handlers.undo_post.remove(clear_id_caches)
+    bpy.app.handlers.redo_post.remove(clear_id_caches)
 
     from . handlers import axesHUD, focusHUD, surfaceslideHUD, screencastHUD
 
@@ -172,12 +184,10 @@ def unregister():
     if screencastHUD and "RNA_HANDLE_REMOVED" not in str(screencastHUD):
         bpy.types.SpaceView3D.draw_handler_remove(screencastHUD, 'WINDOW')
 
-    bpy.app.handlers.depsgraph_update_post.remove(axes_HUD)
-    bpy.app.handlers.depsgraph_update_post.remove(focus_HUD)
-    bpy.app.handlers.depsgraph_update_post.remove(surface_slide_HUD)
-    bpy.app.handlers.depsgraph_update_post.remove(update_group)
-    bpy.app.handlers.depsgraph_update_post.remove(update_asset)
-    bpy.app.handlers.depsgraph_update_post.remove(screencast_HUD)
+    bpy.app.handlers.depsgraph_update_post.remove(dispatch_depsgraph_update)
+
+    clear_mesh_caches(None)
+    clear_id_caches(None)
 
     bpy.app.handlers.render_init.remove(decrease_lights_on_render_start)
     bpy.app.handlers.render_cancel.remove(increase_lights_on_render_end)
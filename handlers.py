@@ -1,12 +1,17 @@
 import bpy
 from bpy.app.handlers import persistent
-from . utils.draw import draw_axes_HUD, draw_focus_HUD, draw_surface_slide_HUD, draw_screen_cast_HUD
+from . utils.draw import draw_axes_HUD, invalidate_axes_HUD, draw_focus_HUD, draw_surface_slide_HUD, draw_screen_cast_HUD
 from . utils.registration import get_prefs, reload_msgbus, get_addon
-from . utils.group import update_group_name, select_group_children
+from . utils.group import update_group_name, select_group_children, get_changed_groups, reset_group_registry
 from . utils.light import adjust_lights_for_rendering, get_area_light_poll
 from . utils.view import sync_light_visibility
-
-# import time
+from time import perf_counter
+from . utils.graph import adjacency_cache, invalidate_mesh_adjacency
+from . utils.raycast import bvh_cache, aabb_cache, invalidate_bvh, update_scene_candidates, invalidate_scene_candidates, invalidate_aabb
+from . utils.asset import get_asset_helper_objects, invalidate_asset_helper_index
+from . utils.snap import snap_caches, refresh_snap_caches
+from . utils.ui import clear_pie_states
+from . utils.wm import get_operator_properties_signature
 
 
 axesHUD = None
@@ -15,6 +20,14 @@ focusHUD = None
 surfaceslideHUD = None
 screencastHUD = None
 
+# the last operator's pointer and properties, and whether an undo, redo or file load happened since the last dispatch
+last_operator = None
+undo_happened = False
+
+# set to True to collect call counts and timings of the depsgraph sub-handlers, see print_depsgraph_handler_stats()
+profile = False
+depsgraph_handler_stats = {}
+
 
 @persistent
 def update_msgbus(none):
@@ -22,7 +35,74 @@ def update_msgbus(none):
 
 
 @persistent
-def update_group(none):
+def update_mesh_caches(scene, depsgraph):
+    '''
+    drop cached mesh adjacencies, BVHs and bounding boxes as soon as the geometry of their mesh or object is updated
+    transform changes are picked up by the bounding box cache itself, by comparing the world matrix
+    '''
+
+    # the scene ray casting candidates only refresh the entries affected by transform, geometry or visibility changes
+    update_scene_candidates(depsgraph)
+
+    if adjacency_cache or bvh_cache or aabb_cache:
+        for update in depsgraph.updates:
+            if update.is_updated_geometry:
+                id = update.id.original
+
+                if isinstance(id, bpy.types.Object):
+                    invalidate_bvh(id)
+                    invalidate_aabb(id)
+
+                    if id.type == 'MESH':
+                        id = id.data
+
+                if isinstance(id, bpy.types.Mesh):
+                    invalidate_mesh_adjacency(id)
+                    invalidate_bvh(id)
+
+
+@persistent
+def update_snap_caches(scene, depsgraph):
+    '''
+    keep the caches of running snapping modals warm, by re-caching objects, whose geometry or modifier stack has changed
+    '''
+
+    if snap_caches:
+        refresh_snap_caches(depsgraph)
+
+
+@persistent
+def clear_mesh_caches(none):
+    '''
+    pointers and names can be reused by a newly loaded file, so nothing cached can be trusted anymore
+    '''
+
+    invalidate_mesh_adjacency()
+    invalidate_bvh()
+    invalidate_scene_candidates()
+    invalidate_aabb()
+
+
+@persistent
+def clear_id_caches(none):
+    '''
+    undo and redo rebuild all ID datablocks, and loading a file replaces them, so cached ID pointers can't be trusted anymore
+    '''
+
+    global undo_happened
+
+    invalidate_asset_helper_index()
+    clear_pie_states()
+
+    # the group registry keeps the group empties themselves
+    reset_group_registry(clear=True)
+
+    # undo and redo don't necessarily change the last operator's pointer, nor do redo-last (F9) and redo panel changes, which undo first
+    undo_happened = True
+
+
+@persistent
+def update_group(scene, depsgraph):
     context = bpy.context
 
     if context.mode == 'OBJECT':
@@ -47,17 +127,14 @@ def update_group(none):
 
         # HIDE / UNHIDE
 
-        if context.scene.M3.group_hide and getattr(context, 'visible_objects', None):
-            selected = [obj for obj in context.visible_objects if obj.M3.is_group_empty and obj.select_get()]
-            unselected = [obj for obj in context.visible_objects if obj.M3.is_group_empty and not obj.select_get()]
-
-            if selected:
-                for group in selected:
+        # only the groups, whose selection state has flipped since the last update are touched, to avoid triggering needless depsgraph updates
+        if context.scene.M3.group_hide and getattr(context, 'view_layer', None):
+            for group, selected in get_changed_groups(context.view_layer, depsgraph):
+                if selected:
                     group.show_name = True
                     group.empty_display_size = group.M3.group_size
 
-            if unselected:
-                for group in unselected:
+                else:
                     group.show_name = False
 
                     # store existing non-zero size
@@ -69,8 +146,12 @@ def update_group(none):
 
 @persistent
 def update_asset(none):
+    '''
+    unlink the stash objects and decal backups, that come along with an inserted asset, from the scene
+    only the helpers of the just-inserted instance collection are looked at, so the cost depends on the asset size, not the scene size
+    '''
+
     context = bpy.context
-    # return
 
     if context.mode == 'OBJECT':
 
@@ -84,24 +165,12 @@ def update_asset(none):
 
             if lastop.bl_idname == 'OBJECT_OT_transform_to_mouse':
                 # print("inserting an asset")
-                # start = time.time()
-
-                for obj in context.scene.objects:
-                    if obj.MM.isstashobj:
-                        # print(" STASH!")
 
-                        for col in obj.users_collection:
-                            # print(f"  unlinking {obj.name} from {col.name}")
-                            col.objects.unlink(obj)
+                for obj in get_asset_helper_objects(active.instance_collection):
+                    # print(f" unlinking {'STASH' if obj.MM.isstashobj else 'DECAL BACKUP'} {obj.name} from {[col.name for col in obj.users_collection]}")
 
-                    if obj.DM.isbackup:
-                        # print(" DECAL BACKUP!")
-
-                        for col in obj.users_collection:
-                            # print(f"  unlinking {obj.name} from {col.name}")
-                            col.objects.unlink(obj)
-
-                # print(f" done, after {time.time() - start:.20f} seconds")
+                    for col in obj.users_collection:
+                        col.objects.unlink(obj)
 
 
 @persistent
@@ -133,8 +202,9 @@ def axes_HUD(scene):
                 # print("  removing previous draw handler")
                 bpy.types.SpaceView3D.draw_handler_remove(axesHUD, 'WINDOW')
 
-            # create a new handler
+            # create a new handler, drawing a new batch
             # print("  adding new draw handler")
+            invalidate_axes_HUD()
             axesHUD = bpy.types.SpaceView3D.draw_handler_add(draw_axes_HUD, (bpy.context, axes_objects), 'WINDOW', 'POST_VIEW')
 
     # remove the handler when no axes objects are present anymore
@@ -145,6 +215,16 @@ def axes_HUD(scene):
         prev_axes_objects = []
 
 
+@persistent
+def update_axes_HUD(scene):
+    '''
+    the axes HUD batch is only rebuilt when the axes objects have been transformed
+    '''
+
+    if axesHUD:
+        invalidate_axes_HUD()
+
+
 @persistent
 def focus_HUD(scene):
     global focusHUD
@@ -209,6 +289,106 @@ def screencast_HUD(scene):
         screencastHUD = None
 
 
+# DEPSGRAPH DISPATCH
+
+# the sub-handlers run on depsgraph updates, the changes they depend on, None meaning every update, and whether they take the depsgraph too
+# NOTE: changing the selection of an object is used in various places to force the HUD handlers to update, which comes through as a SCENE change
+depsgraph_handlers = [(update_mesh_caches, None, True),
+                      (update_snap_caches, {'GEOMETRY'}, True),
+                      (axes_HUD, {'SCENE', 'OBJECT'}, False),
+                      (update_axes_HUD, {'TRANSFORM'}, False),
+                      (focus_HUD, {'SCENE', 'OPERATOR'}, False),
+                      (surface_slide_HUD, {'SCENE', 'GEOMETRY', 'OPERATOR'}, False),
+                      (update_group, {'SCENE', 'OBJECT', 'OPERATOR'}, True),
+                      (update_asset, {'OPERATOR'}, False),
+                      (screencast_HUD, {'SCENE', 'OPERATOR'}, False)]
+
+
+def get_depsgraph_changes(depsgraph):
+    '''
+    classify the depsgraph updates into SCENE, OBJECT, TRANSFORM and GEOMETRY changes
+    OBJECT being object updates that are neither transform nor geometry updates, such as property changes
+    and add an OPERATOR change, if a new operator was added to the stack, the last one was redone, or an undo happened since the last dispatch
+    '''
+
+    global last_operator, undo_happened
+
+    changes = set()
+
+    for update in depsgraph.updates:
+        id = update.id
+
+        if isinstance(id, bpy.types.Object):
+            if update.is_updated_transform:
+                changes.add('TRANSFORM')
+
+            if update.is_updated_geometry:
+                changes.add('GEOMETRY')
+
+            if not (update.is_updated_transform or update.is_updated_geometry):
+                changes.add('OBJECT')
+
+        elif isinstance(id, (bpy.types.Scene, bpy.types.Collection)):
+            changes.add('SCENE')
+
+        elif update.is_updated_geometry:
+            changes.add('GEOMETRY')
+
+    operators = bpy.context.window_manager.operators
+    operator = (operators[-1].as_pointer(), get_operator_properties_signature(operators[-1])) if operators else None
+
+    if operator != last_operator or undo_happened:
+        last_operator = operator
+        undo_happened = False
+        changes.add('OPERATOR')
+
+    return changes
+
+
+@persistent
+def dispatch_depsgraph_update(scene, depsgraph):
+    '''
+    inspect the depsgraph updates once, and only run the sub-handlers, whose inputs have changed
+    '''
+
+    changes = get_depsgraph_changes(depsgraph)
+
+    for handler, triggers, pass_depsgraph in depsgraph_handlers:
+        run = triggers is None or bool(triggers & changes)
+
+        if profile:
+            stats = depsgraph_handler_stats.setdefault(handler.__name__, {'calls': 0, 'skipped': 0, 'time': 0})
+
+            if not run:
+                stats['skipped'] += 1
+                continue
+
+            start = perf_counter()
+
+        elif not run:
+            continue
+
+        if pass_depsgraph:
+            handler(scene, depsgraph)
+        else:
+            handler(scene)
+
+        if profile:
+            stats['calls'] += 1
+            stats['time'] += perf_counter() - start
+
+
+def print_depsgraph_handler_stats(reset=True):
+    print("\nMACHIN3tools depsgraph handlers")
+
+    for name, stats in depsgraph_handler_stats.items():
+        total = stats['calls'] + stats['skipped']
+        print(f" {name}: called {stats['calls']}/{total}, skipped {stats['skipped']}, {stats['time'] * 1000:.3f}ms total, {stats['time'] * 1000 / max(stats['calls'], 1):.3f}ms per call")
+
+    if reset:
+        depsgraph_handler_stats.clear()
+
+
 debug = False
 # debug = True
 
@@ -33,6 +33,9 @@ matcap_background_type_items = [("THEME", "Theme", ""),
                                 ("WORLD", "World", ""),
                                 ("VIEWPORT", "Viewport", "")]
 
+render_seed_combine_items = [("MIN", "Minimum", "Keep the darkest Value of all Seeds for each Pixel"),
+                             ("MEDIAN", "Median", "Keep the median Value of all Seeds for each Pixel, more robust against dark Noise, but slower")]
+
 
 # OPERATORS
 
@@ -87,6 +90,10 @@ obj_align_mode_items = [('ORIGIN', 'Origin', ''),
                         ('ACTIVE', 'Active', ''),
                         ('FLOOR', 'Floor', '')]
 
+obj_align_floor_items = [('MESH', 'Mesh', 'Drop the lowest Vertex of the Mesh to the Floor'),
+                         ('EVALUATED', 'Evaluated', 'Drop the lowest Vertex of the Mesh, including its Modifiers, to the Floor'),
+                         ('BOUNDS', 'Bounds', 'Drop the lowest Corner of the Bounding Box to the Floor, fast, but only exact for unrotated Objects')]
+
 cleanup_select_items = [("NON-MANIFOLD", "Non-Manifold", ""),
                         ("NON-PLANAR", "Non-Planar", ""),
                         ("TRIS", "Tris", ""),
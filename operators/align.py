@@ -2,13 +2,15 @@ import bpy
 from bpy.props import BoolProperty, EnumProperty, FloatProperty
 from mathutils import Matrix, Vector, Euler, Quaternion
 from math import radians
+import numpy as np
 from .. utils.math import get_loc_matrix, get_rot_matrix, get_sca_matrix, average_locations
 from .. utils.object import compensate_children, parent, unparent
-from .. utils.draw import draw_mesh_wire, draw_label, update_HUD_location
+from .. utils.draw import draw_label, update_HUD_location, DrawBatch
 from .. utils.mesh import get_coords
 from .. utils.ui import init_cursor, init_status, finish_status
 from .. utils.system import printd
-from .. items import obj_align_mode_items
+from .. utils.raycast import get_world_aabb
+from .. items import obj_align_mode_items, obj_align_floor_items
 from .. colors import green, blue
 
 
@@ -22,6 +24,7 @@ class Align(bpy.types.Operator):
     inbetween_flip: BoolProperty(name="Flip", default=False)
 
     mode: EnumProperty(name='Mode', items=obj_align_mode_items, default='ACTIVE')
+    floor: EnumProperty(name='Floor', items=obj_align_floor_items, default='MESH')
 
     location: BoolProperty(name='Align Location', default=True)
     rotation: BoolProperty(name='Align Rotation', default=True)
@@ -92,6 +95,12 @@ class Align(bpy.types.Operator):
                     r.prop(self, 'rot_y', toggle=True)
                     r.prop(self, 'rot_z', toggle=True)
 
+                if self.mode == 'FLOOR':
+                    row = column.split(factor=0.3)
+                    row.label(text='Drop')
+                    r = row.row()
+                    r.prop(self, 'floor', expand=True)
+
                 if self.mode == 'ACTIVE':
                     row = column.split(factor=0.3)
                     row.prop(self, 'scale', text='Scale')
@@ -159,8 +168,8 @@ class Align(bpy.types.Operator):
         elif self.mode == 'FLOOR':
             # for some reason a dg is neccessary, in a fresh startup scene, when running clear location followed for floor alignment
             # not for the other alignment types however, and only once at the very beginning at the start of the scene editing
-            context.evaluated_depsgraph_get()
-            self.drop_to_floor(context, sel)
+            dg = context.evaluated_depsgraph_get()
+            self.drop_to_floor(context, dg, sel)
 
         return {'FINISHED'}
 
@@ -352,13 +361,33 @@ class Align(bpy.types.Operator):
             else:
                 obj.matrix_world = armature.matrix_world @ bone.matrix @ Matrix.Rotation(radians(self.roll_amount if self.roll else 0), 4, 'Y')
 
-    def drop_to_floor(self, context, selection):
+    def drop_to_floor(self, context, dg, selection):
+        '''
+        move the lowest point of each mesh object to the floor, empties just get their z location removed
+        the lowest point is either determined from the mesh's vertices, optionally including modifiers, or from the cached world space bounding box
+        '''
+
         for obj in selection:
             mx = obj.matrix_world
             oldmx = mx.copy()
 
             if obj.type == 'MESH':
-                minz = min((mx @ v.co)[2] for v in obj.data.vertices)
+                if self.floor == 'BOUNDS':
+                    minz = get_world_aabb(obj, dg)[0][2]
+
+                else:
+                    mesh = obj.evaluated_get(dg).data if self.floor == 'EVALUATED' else obj.data
+
+                    if not mesh.vertices:
+                        continue
+
+                    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+                    mesh.vertices.foreach_get('co', coords)
+
+                    # only the world space z coordinates are needed, so a single row of the matrix is enough
+                    row = np.array(mx.row[2])
+                    minz = (coords.reshape(-1, 3) @ row[:3]).min() + row[3]
+
                 mx.translation.z -= minz
 
             elif obj.type == 'EMPTY':
@@ -436,7 +465,8 @@ class AlignRelative(bpy.types.Operator):
     def draw_VIEW3D(self):
         for obj in self.targets:
             for batch in self.batches[obj]:
-                draw_mesh_wire(batch, color=green if self.instance else blue, alpha=0.5)
+                batch.update(color=green if self.instance else blue)
+                batch.draw()
 
     def draw_HUD(self, args):
         context, event = args
@@ -452,10 +482,10 @@ class AlignRelative(bpy.types.Operator):
         # update target object list, usually you could do this only on LEFTMOUSE events, but the retarded, default RELEASE select keymap prevents this
         self.targets = [obj for obj in context.selected_objects if obj not in self.orig_sel]
 
-        # create batches for VIEW3D preview
+        # create batches for VIEW3D preview, once per target, as the coords don't change while the target is selected
         for obj in self.targets:
             if obj not in self.batches:
-                self.batches[obj] = [get_coords(aligner.data, obj.matrix_world @ self.deltamx[aligner], indices=True) for aligner in self.aligners if aligner.data]
+                self.batches[obj] = [DrawBatch('LINES', *get_coords(aligner.data, obj.matrix_world @ self.deltamx[aligner], indices=True), color=green if self.instance else blue, alpha=0.5) for aligner in self.aligners if aligner.data]
 
         events = ['MOUSEMOVE', 'WHEELUPMOUSE', 'WHEELDOWNMOUSE']
 
@@ -1,14 +1,120 @@
 import bpy
 from bpy.props import BoolProperty, EnumProperty, FloatProperty
 import bmesh
-from mathutils.geometry import distance_point_to_plane
 from mathutils import Vector
-import math
+import numpy as np
+from time import perf_counter
 from .. utils.registration import get_prefs
+from .. utils.graph import get_mesh_adjacency, invalidate_mesh_adjacency, sync_edit_mesh
 from .. items import cleanup_select_items
 from .. colors import white, green, red, yellow
 
 
+# ANALYSIS
+
+# NOTE: these only ever see numpy arrays and plain values, never bpy data
+
+def get_angles(vectors1, vectors2):
+    '''
+    return the angles in degrees between two arrays of vectors
+    zero length vectors result in nan, which fails any comparison, so those are never considered redundant
+    '''
+
+    lengths = np.linalg.norm(vectors1, axis=1) * np.linalg.norm(vectors2, axis=1)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cosines = np.einsum('ij,ij->i', vectors1, vectors2) / lengths
+
+    return np.degrees(np.arccos(np.clip(cosines, -1, 1)))
+
+
+def get_loose_geometry(adjacency, verts, edges, faces):
+    '''
+    return the indices of loose verts, edges and faces
+    removing loose verts doesn't affect any edges, and removing loose edges doesn't affect the manifoldness of any face's edges
+    so all three can be determined up front, before anything is deleted
+    '''
+
+    loose_verts = adjacency.get_loose_verts().nonzero()[0] if verts else []
+    loose_edges = adjacency.get_loose_edges().nonzero()[0] if edges else []
+    loose_faces = adjacency.get_loose_faces().nonzero()[0] if faces else []
+
+    return loose_verts, loose_edges, loose_faces
+
+
+def get_redundant_edges(adjacency, normals, angle):
+    '''
+    return the indices of manifold edges, whose face normals are closer together than 180 - angle
+    '''
+
+    # the two faces of each manifold edge
+    manifold_edges = adjacency.get_manifold_edges().nonzero()[0]
+    offsets, edge_faces = adjacency.edge_faces
+
+    angles = get_angles(normals[edge_faces[offsets[manifold_edges]]], normals[edge_faces[offsets[manifold_edges] + 1]])
+
+    return manifold_edges[angles < 180 - angle]
+
+
+def get_redundant_verts(adjacency, coords, angle):
+    '''
+    return the indices of two-edged verts, whose edges are straighter than angle
+    '''
+
+    # the two other verts of each two-edged vert
+    two_edged_verts = (adjacency.vert_degrees == 2).nonzero()[0]
+    offsets, vert_verts = adjacency.vert_verts
+
+    vectors1 = coords[vert_verts[offsets[two_edged_verts]]] - coords[two_edged_verts]
+    vectors2 = coords[vert_verts[offsets[two_edged_verts] + 1]] - coords[two_edged_verts]
+
+    return two_edged_verts[get_angles(vectors1, vectors2) > angle]
+
+
+def get_non_planar_faces(adjacency, coords, normals, threshold):
+    '''
+    return bool mask of faces with more than 3 verts, where any vert is further away from the plane through the face's median center than the threshold
+    '''
+
+    faces = adjacency.face_sizes > 3
+
+    if not faces.any():
+        return faces
+
+    starts = adjacency.face_offsets[:-1]
+    loop_coords = coords[adjacency.loop_verts]
+
+    centers = np.add.reduceat(loop_coords, starts) / adjacency.face_sizes[:, None]
+    distances = np.abs(np.einsum('ij,ij->i', loop_coords - centers[adjacency.loop_faces], normals[adjacency.loop_faces]))
+
+    return faces & (np.maximum.reduceat(distances, starts) > threshold)
+
+
+def get_selection(adjacency, coords, normals, select_type, threshold):
+    '''
+    return whether there are any non-manifold edges, and the indices of the edges or faces to select for the passed in select_type
+    '''
+
+    non_manifold_edges = ~adjacency.get_manifold_edges()
+
+    if select_type == "NON-MANIFOLD":
+        indices = non_manifold_edges.nonzero()[0]
+
+    elif select_type == "NON-PLANAR":
+        indices = get_non_planar_faces(adjacency, coords, normals, threshold).nonzero()[0]
+
+    elif select_type == "TRIS":
+        indices = (adjacency.face_sizes == 3).nonzero()[0]
+
+    elif select_type == "NGONS":
+        indices = (adjacency.face_sizes > 4).nonzero()[0]
+
+    else:
+        indices = []
+
+    return non_manifold_edges.any(), indices
+
+
 class CleanUp(bpy.types.Operator):
     bl_idname = "machin3.clean_up"
     bl_label = "MACHIN3: Clean Up"
@@ -37,6 +143,8 @@ class CleanUp(bpy.types.Operator):
 
     view_selected: BoolProperty(name="View Selected", default=False)
 
+    report_timing: BoolProperty(name="Report Timing", description="Print the time spent on and the element counts of each object to the terminal", default=False)
+
     def draw(self, context):
         layout = self.layout
         box = layout.box()
@@ -92,6 +200,8 @@ class CleanUp(bpy.types.Operator):
             row.active = self.select
             row.prop(self, "planar_threshold", text='Threshold')
 
+        layout.prop(self, "report_timing")
+
     @classmethod
     def poll(cls, context):
         return context.mode == "EDIT_MESH"
@@ -103,24 +213,36 @@ class CleanUp(bpy.types.Operator):
     def execute(self, context):
         sel = {obj for obj in context.selected_objects if obj.type == 'MESH' and obj.mode == 'EDIT'} | {context.active_object}
 
-        removed = {}
+        starttime = perf_counter()
+        self.timings = {obj: 0 for obj in sel}
 
-        is_any_non_manifold = False
+        # the meshes are only synced with their edit bmeshes for an analysis, if they have been changed since the previous one
+        self.unsynced = set(sel)
 
-        for obj in sel:
-            bm, elementcounts, is_non_manifold = self.clean_up(obj)
+        bms, elementcounts = self.clean_up(sel)
 
-            if is_non_manifold:
-                is_any_non_manifold = True
+        non_manifold = self.select_geometry(bms)
 
-            if self.select:
-                self.select_geometry(bm)
+        removed = {}
+        cleanedcounts = {}
+
+        for obj, bm in bms.items():
+            start = perf_counter()
 
-            cleanedcounts = self.get_element_counts(bm)
+            cleanedcounts[obj] = self.get_element_counts(bm)
             bmesh.update_edit_mesh(obj.data)
 
-            if elementcounts != cleanedcounts:
-                removed[obj] = (elementcounts[0] - cleanedcounts[0], elementcounts[1] - cleanedcounts[1], elementcounts[2] - cleanedcounts[2])
+            if elementcounts[obj] != cleanedcounts[obj]:
+                removed[obj] = tuple(before - after for before, after in zip(elementcounts[obj], cleanedcounts[obj]))
+
+            self.timings[obj] += perf_counter() - start
+
+        is_any_non_manifold = any(non_manifold.values())
+
+        totaltime = perf_counter() - starttime
+
+        if self.report_timing:
+            self.print_timings(elementcounts, cleanedcounts, non_manifold, totaltime)
 
         if self.select and self.view_selected:
             bpy.ops.view3d.view_selected('INVOKE_DEFAULT', use_all_regions=False)
@@ -139,13 +261,16 @@ class CleanUp(bpy.types.Operator):
             extreme = any([c >= 10 for c in [verts, edges, faces]])
             time = get_prefs().HUD_fade_clean_up
 
+            if self.report_timing:
+                text += f" in {totaltime:.2f}s"
+
             if is_any_non_manifold:
                 bpy.ops.machin3.draw_labels(text=text, text2="Non-Manifold Edges found!", coords=self.coords, center=False, color=yellow if extreme else white, color2=red, time=time, alpha=1)
             else:
                 bpy.ops.machin3.draw_label(text=text, coords=self.coords, center=False, color=yellow if extreme else white, time=time, alpha=1)
 
         else:
-            text = "Nothing to remove."
+            text = f"Nothing to remove in {totaltime:.2f}s" if self.report_timing else "Nothing to remove."
             time = get_prefs().HUD_fade_clean_up
 
             if is_any_non_manifold:
@@ -158,35 +283,52 @@ class CleanUp(bpy.types.Operator):
 
         return {'FINISHED'}
 
-    def clean_up(self, active):
-        bm = bmesh.from_edit_mesh(active.data)
-        bm.normal_update()
-        bm.verts.ensure_lookup_table()
+    def clean_up(self, sel):
+        bms = {}
+        elementcounts = {}
+
+        for obj in sel:
+            start = perf_counter()
+
+            bm = bmesh.from_edit_mesh(obj.data)
+            bm.normal_update()
+            bm.verts.ensure_lookup_table()
 
-        elementcounts = self.get_element_counts(bm)
+            bms[obj] = bm
+            elementcounts[obj] = self.get_element_counts(bm)
 
-        if self.remove_doubles:
-            bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=self.distance)
+            if self.remove_doubles:
+                bmesh.ops.remove_doubles(bm, verts=bm.verts, dist=self.distance)
 
-        if self.dissolve_degenerate:
-            bmesh.ops.dissolve_degenerate(bm, edges=bm.edges, dist=self.distance)
+            if self.dissolve_degenerate:
+                bmesh.ops.dissolve_degenerate(bm, edges=bm.edges, dist=self.distance)
+
+            if self.remove_doubles or self.dissolve_degenerate:
+                self.set_changed(obj)
+
+            self.timings[obj] += perf_counter() - start
 
         if self.delete_loose:
-            self.delete_loose_geometry(bm)
+            self.delete_loose_geometry(bms)
 
         if self.dissolve_redundant:
-            self.dissolve_redundant_geometry(bm)
+            self.dissolve_redundant_geometry(bms)
 
         if self.recalc_normals:
-            bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
+            for obj, bm in bms.items():
+                start = perf_counter()
 
-            if self.flip_normals:
-                for f in bm.faces:
-                    f.normal_flip()
+                bmesh.ops.recalc_face_normals(bm, faces=bm.faces)
 
-        is_non_manifold = any([e for e in bm.edges if not e.is_manifold])
+                if self.flip_normals:
+                    bmesh.ops.reverse_faces(bm, faces=bm.faces)
 
-        return bm, elementcounts, is_non_manifold
+                # flipping reverses the loop order of the faces
+                self.set_changed(obj, topology=self.flip_normals)
+
+                self.timings[obj] += perf_counter() - start
+
+        return bms, elementcounts
 
     def get_element_counts(self, bm):
         '''
@@ -194,91 +336,158 @@ class CleanUp(bpy.types.Operator):
         '''
         return len(bm.verts), len(bm.edges), len(bm.faces)
 
-    def delete_loose_geometry(self, bm):
-        if self.delete_loose_verts:
-            loose_verts = [v for v in bm.verts if not v.link_edges]
-            bmesh.ops.delete(bm, geom=loose_verts, context="VERTS")
+    def print_timings(self, elementcounts, cleanedcounts, non_manifold, totaltime):
+        print(f"\nMACHIN3tools Clean Up of {len(self.timings)} {'object' if len(self.timings) == 1 else 'objects'} took {totaltime:.3f}s")
+
+        for obj, duration in sorted(self.timings.items(), key=lambda x: x[1], reverse=True):
+            counts = ", ".join(f"{name}: {before} -> {after}" for name, before, after in zip(['Verts', 'Edges', 'Faces'], elementcounts[obj], cleanedcounts[obj]))
+            print(f" {duration:.3f}s {obj.name} | {counts}{' | Non-Manifold' if non_manifold[obj] else ''}")
+
+
+    # ANALYSIS
+
+    def get_mesh_data(self, obj, bm, coords=False, normals=False):
+        '''
+        return the mesh adjacency, and optionally the vert coordinates and face normals as float64 arrays, with indices matching the bmesh's
+        the edit bmesh is written into the mesh first, so they can be pulled via foreach_get, but only if it has been changed since
+        '''
+
+        start = perf_counter()
+
+        mesh = obj.data
+
+        if obj in self.unsynced:
+            sync_edit_mesh(obj, bm)
+            self.unsynced.discard(obj)
+
+        adjacency = get_mesh_adjacency(mesh)
+
+        if coords:
+            coords = np.empty((adjacency.vert_count, 3), dtype=np.float64)
+            mesh.vertices.foreach_get('co', np.reshape(coords, adjacency.vert_count * 3))
+
+        if normals:
+            normals = np.empty((adjacency.face_count, 3), dtype=np.float64)
+            mesh.polygons.foreach_get('normal', np.reshape(normals, adjacency.face_count * 3))
 
-        if self.delete_loose_edges:
-            loose_edges = [e for e in bm.edges if not e.link_faces]
-            bmesh.ops.delete(bm, geom=loose_edges, context="EDGES")
+        self.timings[obj] += perf_counter() - start
 
-        if self.delete_loose_faces:
-            loose_faces = [f for f in bm.faces if all([not e.is_manifold for e in f.edges])]
-            bmesh.ops.delete(bm, geom=loose_faces, context="FACES")
+        return adjacency, coords, normals
 
-    def dissolve_redundant_geometry(self, bm):
+    def set_changed(self, obj, topology=True):
+        '''
+        note that the edit bmesh of the object has been changed, so its mesh is synced again before the next analysis
+        and drop the cached adjacency if the topology was changed, which the depsgraph only reports after the operator has finished
+        '''
+
+        self.unsynced.add(obj)
+
+        if topology:
+            invalidate_mesh_adjacency(obj.data)
+
+
+    # CLEAN UP
+
+    def delete_loose_geometry(self, bms):
+        for obj, bm in bms.items():
+            adjacency, _, _ = self.get_mesh_data(obj, bm)
+
+            start = perf_counter()
+
+            loose_verts, loose_edges, loose_faces = get_loose_geometry(adjacency, self.delete_loose_verts, self.delete_loose_edges, self.delete_loose_faces)
+
+            if len(loose_verts):
+                bmesh.ops.delete(bm, geom=[bm.verts[idx] for idx in loose_verts], context="VERTS")
+
+            if len(loose_edges):
+                bmesh.ops.delete(bm, geom=[bm.edges[idx] for idx in loose_edges], context="EDGES")
+
+            if len(loose_faces):
+                bmesh.ops.delete(bm, geom=[bm.faces[idx] for idx in loose_faces], context="FACES")
+
+            if len(loose_verts) or len(loose_edges) or len(loose_faces):
+                self.set_changed(obj)
+
+            self.timings[obj] += perf_counter() - start
+
+    def dissolve_redundant_geometry(self, bms):
         '''
         dissolve redundant verts on straight edges
         dissolve redundant edges on flat faces
         '''
 
         if self.dissolve_redundant_edges:
-            manifold_edges = [e for e in bm.edges if e.is_manifold]
+            for obj, bm in bms.items():
+                adjacency, _, normals = self.get_mesh_data(obj, bm, normals=True)
+
+                start = perf_counter()
+
+                indices = get_redundant_edges(adjacency, normals, self.dissolve_redundant_angle)
 
-            redundant_edges = []
+                if len(indices):
+                    redundant_edges = [bm.edges[idx] for idx in indices]
 
-            for e in manifold_edges:
-                angle = math.degrees(e.calc_face_angle(0))
+                    bmesh.ops.dissolve_edges(bm, edges=redundant_edges, use_verts=False)
 
-                if angle < 180 - self.dissolve_redundant_angle:
-                    redundant_edges.append(e)
+                    # dissolving with use_verts enabled can cause problems in som cases, so it's better to check the left over edges for 2 edged verts, and remove those in a separate step
+                    two_edged_verts = {v for e in redundant_edges if e.is_valid for v in e.verts if len(v.link_edges) == 2}
+                    bmesh.ops.dissolve_verts(bm, verts=list(two_edged_verts))
 
-            bmesh.ops.dissolve_edges(bm, edges=redundant_edges, use_verts=False)
+                    self.set_changed(obj)
 
-            # dissolving with use_verts enabled can cause problems in som cases, so it's better to check the left over edges for 2 edged verts, and remove those in a separate step
-            two_edged_verts = {v for e in redundant_edges if e.is_valid for v in e.verts if len(v.link_edges) == 2}
-            bmesh.ops.dissolve_verts(bm, verts=list(two_edged_verts))
+                self.timings[obj] += perf_counter() - start
 
         # also run vert removal after edge removal to ensure verts from symmetry center lines get removed properly
         if self.dissolve_redundant_verts:
-            two_edged_verts = [v for v in bm.verts if len(v.link_edges) == 2]
+            for obj, bm in bms.items():
+                adjacency, coords, _ = self.get_mesh_data(obj, bm, coords=True)
 
-            redundant_verts = []
+                start = perf_counter()
 
-            for v in two_edged_verts:
-                e1 = v.link_edges[0]
-                e2 = v.link_edges[1]
+                indices = get_redundant_verts(adjacency, coords, self.dissolve_redundant_angle)
 
-                vector1 = e1.other_vert(v).co - v.co
-                vector2 = e2.other_vert(v).co - v.co
+                if len(indices):
+                    bmesh.ops.dissolve_verts(bm, verts=[bm.verts[idx] for idx in indices])
 
-                angle = min(math.degrees(vector1.angle(vector2)), 180)
+                    self.set_changed(obj)
 
-                if self.dissolve_redundant_angle < angle:
-                    redundant_verts.append(v)
+                self.timings[obj] += perf_counter() - start
 
-            bmesh.ops.dissolve_verts(bm, verts=redundant_verts)
+    def select_geometry(self, bms):
+        '''
+        select the geometry of the chosen select type, if selection is enabled
+        return dict of whether each object has non-manifold edges
+        '''
+
+        non_planar = self.select and self.select_type == 'NON-PLANAR'
 
-    def select_geometry(self, bm):
-        for f in bm.faces:
-            f.select = False
+        non_manifold = {}
 
-        bm.select_flush(False)
+        for obj, bm in bms.items():
+            adjacency, coords, normals = self.get_mesh_data(obj, bm, coords=non_planar, normals=non_planar)
 
-        if self.select_type == "NON-MANIFOLD":
-            edges = [e for e in bm.edges if not e.is_manifold]
+            start = perf_counter()
 
-            for e in edges:
-                e.select = True
+            non_manifold[obj], indices = get_selection(adjacency, coords, normals, self.select_type if self.select else None, self.planar_threshold)
 
-        elif self.select_type == "NON-PLANAR":
-            faces = [f for f in bm.faces if len(f.verts) > 3]
+            if self.select:
+                for f in bm.faces:
+                    f.select = False
 
-            for f in faces:
-                distances = [distance_point_to_plane(v.co, f.calc_center_median(), f.normal) for v in f.verts]
+                bm.select_flush(False)
 
-                if any([d for d in distances if abs(d) > self.planar_threshold]):
-                    f.select_set(True)
+                if self.select_type == "NON-MANIFOLD":
+                    for idx in indices:
+                        bm.edges[idx].select = True
 
-        elif self.select_type == "TRIS":
-            faces = [f for f in bm.faces if len(f.verts) == 3]
+                elif self.select_type == "NON-PLANAR":
+                    for idx in indices:
+                        bm.faces[idx].select_set(True)
 
-            for f in faces:
-                f.select = True
+                else:
+                    for idx in indices:
+                        bm.faces[idx].select = True
 
-        elif self.select_type == "NGONS":
-            faces = [f for f in bm.faces if len(f.verts) > 4]
+            self.timings[obj] += perf_counter() - start
 
-            for f in faces:
-                f.select = True
+        return non_manifold
@@ -1,7 +1,7 @@
 import bpy
 from bpy.props import EnumProperty, BoolProperty
 from .. utils.object import parent, unparent
-from .. utils.group import group, ungroup, get_group_matrix, select_group_children, get_child_depth, clean_up_groups, fade_group_sizes
+from .. utils.group import group, ungroup, get_group_matrix, select_group_children, get_child_depth, clean_up_groups, fade_group_sizes, register_group
 from .. utils.collection import get_collection_depth
 from .. utils.registration import get_prefs
 from .. utils.modifier import get_mods_as_dict, add_mods_from_dict
@@ -295,6 +295,8 @@ class Groupify(bpy.types.Operator):
                 if not any([s in obj.name.lower() for s in ['grp', 'group']]):
                     obj.name = f"{obj.name}_GROUP"
 
+                register_group(obj)
+
                 # do it all the way down
                 self.groupify(obj.children)
 
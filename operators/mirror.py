@@ -1,7 +1,7 @@
 import bpy
 from bpy.props import BoolProperty, EnumProperty
 from bpy_extras.view3d_utils import region_2d_to_location_3d, region_2d_to_origin_3d, region_2d_to_vector_3d
-from mathutils import Vector
+from mathutils import Vector, Matrix
 from .. utils.registration import get_addon, get_prefs
 from .. utils.tools import get_active_tool
 from .. utils.object import parent, unparent, get_eval_bbox
@@ -9,7 +9,7 @@ from .. utils.math import compare_matrix
 from .. utils.mesh import get_coords
 from .. utils.modifier import remove_mod
 from .. utils.ui import get_zoom_factor, get_flick_direction, init_status, finish_status
-from .. utils.draw import draw_vector, draw_circle, draw_point, draw_label, draw_bbox, draw_cross_3d
+from .. utils.draw import draw_vector, draw_circle, draw_point, draw_label, get_bbox_lines, get_cross_3d_lines, DrawBatch
 from .. utils.system import printd
 from .. utils.property import step_list
 from .. utils.view import get_loc_2d
@@ -226,14 +226,26 @@ class Mirror(bpy.types.Operator):
         if self.remove and self.misaligned and self.use_misalign:
             mx = self.misaligned['matrices'][self.mirror_obj]
 
+            # the batches are created once per mirror object, and the evaluated bbox is only fetched then too
+            batch = self.mirror_obj_batches.get(self.mirror_obj)
+
             if self.mirror_obj.type == 'MESH':
-                bbox = get_eval_bbox(self.mirror_obj)
-                draw_bbox(bbox, mx=mx, color=yellow, corners=0.1, width=2 * self.scale, alpha=0.5)
+                if not batch:
+                    coords, indices = get_bbox_lines(get_eval_bbox(self.mirror_obj), corners=0.1)
+                    batch = self.mirror_obj_batches[self.mirror_obj] = DrawBatch('LINES', coords, indices=indices, color=yellow, width=2 * self.scale, alpha=0.5)
+
+                batch.update(mx=mx)
 
             elif self.mirror_obj.type == 'EMPTY':
-                # get cursor's local space location haha
-                loc = mx.inverted_safe() @ mx.to_translation()
-                draw_cross_3d(loc, mx=mx, color=blue, width=2 * self.scale, length=2 * self.cursor_empty_zoom, alpha=0.99)
+                if not batch:
+                    coords, indices = get_cross_3d_lines(Vector(), length=1)
+                    batch = self.mirror_obj_batches[self.mirror_obj] = DrawBatch('LINES', coords, indices=indices, color=blue, width=2 * self.scale, alpha=0.99)
+
+                # the cross is scaled by the zoom factor via the matrix, so it doesn't need new coords as you zoom
+                batch.update(mx=mx @ Matrix.Scale(2 * self.cursor_empty_zoom, 4))
+
+            if batch:
+                batch.draw()
 
     def modal(self, context, event):
         context.area.tag_redraw()
@@ -412,6 +424,9 @@ class Mirror(bpy.types.Operator):
 
         self.decalmachine = decalmachine
 
+        # retained draw batches of the misaligned mirror objects
+        self.mirror_obj_batches = {}
+
         scene = context.scene
         hc = scene.HC if hypercursor else None
 
@@ -3,10 +3,15 @@ from bpy.props import BoolProperty
 from .. utils.registration import get_prefs
 from .. utils.system import makedir, printd
 from .. utils.math import dynamic_format
+from .. utils.render import seed_worker_script, read_worker_output, combine_seed_images, write_render_log
 import os
 import datetime
 import time
 import platform
+import subprocess
+import threading
+import queue
+import json
 
 
 class Render(bpy.types.Operator):
@@ -34,6 +39,9 @@ class Render(bpy.types.Operator):
 
         if properties.seed:
             desc = f"Render {get_prefs().render_seed_count} seeds, combine all, and save to {outpath + os.sep}"
+
+            if get_prefs().render_seed_workers > 1:
+                desc += f"\nSeeds are rendered in {min(get_prefs().render_seed_workers, get_prefs().render_seed_count)} background processes"
         else:
             desc = f"Render and save to {outpath + os.sep}"
 
@@ -54,6 +62,11 @@ class Render(bpy.types.Operator):
         self.quarter_qual = event.alt and event.ctrl
         self.quad_qual = event.shift and event.ctrl
 
+        # the background workers render from a copy saved next to the blend file, which requires it to be saved
+        if self.seed and min(get_prefs().render_seed_workers, get_prefs().render_seed_count) > 1 and not bpy.data.is_saved:
+            self.report({'ERROR'}, "Save the file first, to render seeds in background processes")
+            return {'CANCELLED'}
+
         self.settings = {'scene': context.scene,
                          'render': context.scene.render,
                          'cycles': context.scene.cycles,
@@ -66,6 +79,7 @@ class Render(bpy.types.Operator):
                          'depth': context.scene.render.image_settings.color_depth,
                          'seed': context.scene.cycles.seed,
                          'seed_count': get_prefs().render_seed_count,
+                         'seed_workers': min(get_prefs().render_seed_workers, get_prefs().render_seed_count),
 
                          'tree': None,
                          'use_nodes': context.scene.use_nodes,
@@ -94,78 +108,95 @@ class Render(bpy.types.Operator):
         # fetch initial time
         starttime = time.time()
 
+        # collect the time of each stage, chained via time_stage()
+        self.timings = []
+        stagetime = time.perf_counter()
+
         # adjust render quality when modifier keys have been pressed
         self.set_render_settings()
 
-        # get output path and blend file name while at it
-        self.get_output_path()
+        # reset to initial quality and settings, even if rendering fails or is aborted
+        try:
 
-        # quality setup
-        self.get_strings()
+            # get output path and blend file name while at it
+            self.get_output_path()
 
-        # prepare rendering terminial output, disable compositing open render view
-        self.prepare_rendering()
+            # quality setup
+            self.get_strings()
 
-        # seed render
-        if self.seed:
+            # prepare rendering terminial output, disable compositing open render view
+            self.prepare_rendering()
 
-            # clear out compositing nodes, and remove potential previous seed renderings
-            self.clear_out_compositor()
+            stagetime = self.time_stage('setup', stagetime)
 
-            # do count renderings, each with a different seed
-            seedpaths, matte_path = self.seed_render()
+            # seed render
+            if self.seed:
 
-            # load previously saved seed renderings
-            images = self.load_seed_renderings(seedpaths)
+                # do count renderings, each with a different seed, the individual seeds are timed within
+                seedpaths, matte_path = self.seed_render()
+                stagetime = time.perf_counter()
 
-            # setup the compositor for firefly removal by mixing the seed renderings
-            basename = self.get_save_path(suffix='seed')
-            self.setup_compositor_for_firefly_removal(images, basename)
+                # background workers failed, their output has been printed already
+                if seedpaths is None:
+                    return {'CANCELLED'}
 
-            # render compositor
-            bpy.ops.render.render(animation=False, write_still=False, use_viewport=False, layer='', scene='')
+                # load previously saved seed renderings
+                images = self.load_seed_renderings(seedpaths)
+                stagetime = self.time_stage('load', stagetime)
 
-            # remove the frame number from the composed image, and properly set the datetime
-            save_path = self.rename_file_output(basename)
+                # combine the seed renderings in memory to remove fireflies, and save the result
+                basename = self.get_save_path(suffix='seed')
+                save_path = self.combine_seed_renderings(images, seedpaths, basename)
 
-            # remove individual seed renderings
-            if not get_prefs().render_keep_seed_renderings:
-                for _, path in seedpaths:
-                    os.remove(path)
+                # remove individual seed renderings
+                if not get_prefs().render_keep_seed_renderings:
+                    for _, path in seedpaths:
+                        os.remove(path)
 
-                # clear out the compositor too, but note that when final is enabled this happens anyway
-                if not self.final:
-                    self.clear_out_compositor()
+            # quick render
+            else:
 
-        # quick render
-        else:
+                if self.final:
 
-            if self.final:
+                    # setup the compositor for cryptomatte export
+                    basename = self.get_save_path(suffix='clownmatte' if get_prefs().render_use_clownmatte_naming else 'cryptomatte')
+                    self.setup_compositor_for_cryptomatte_export(basename)
 
-                # setup the compositor for cryptomatte export
-                basename = self.get_save_path(suffix='clownmatte' if get_prefs().render_use_clownmatte_naming else 'cryptomatte')
-                self.setup_compositor_for_cryptomatte_export(basename)
+                    stagetime = self.time_stage('compositor setup', stagetime)
 
-            # render
-            bpy.ops.render.render(animation=False, write_still=False, use_viewport=False, layer='', scene='')
+                # render
+                bpy.ops.render.render(animation=False, write_still=False, use_viewport=False, layer='', scene='')
+                stagetime = self.time_stage('render', stagetime)
 
-            # save render result
-            save_path = self.get_save_path()
+                # save render result
+                save_path = self.get_save_path()
 
-            # remove the frame number from the composed cryptomatte and properly set the datetime, important to do it after the saving out the render, to ensure a later time code
-            if self.final:
-                matte_path = self.rename_file_output(basename)
+                # remove the frame number from the composed cryptomatte and properly set the datetime, important to do it after the saving out the render, to ensure a later time code
+                if self.final:
+                    matte_path = self.rename_file_output(basename)
 
-            img = bpy.data.images.get('Render Result')
-            img.save_render(filepath=save_path)
+                    # keep the renaming delay out of the timings
+                    stagetime = time.perf_counter()
+
+                img = bpy.data.images.get('Render Result')
+                img.save_render(filepath=save_path)
+
+                stagetime = self.time_stage('save', stagetime)
+
+            # final terminal output
+            rendertime = datetime.timedelta(seconds=int(time.time() - starttime))
+            print(f"\nRendering finished after {rendertime}")
+            print(f"          saved to {save_path}")
 
-        # final terminal output
-        rendertime = datetime.timedelta(seconds=int(time.time() - starttime))
-        print(f"\nRendering finished after {rendertime}")
-        print(f"          saved to {save_path}")
+            # log the stage timings beside the renders
+            if get_prefs().render_log_timings:
+                self.timings.append(('total', time.time() - starttime))
 
-        # reset to initial quality
-        self.reset_render_settings()
+                log_path = write_render_log(self.settings['outpath'], self.get_log_info(), self.timings)
+                print(f"          timings logged to {log_path}")
+
+        finally:
+            self.reset_render_settings()
 
         # bring cryptomatte into compositor
         if self.final:
@@ -303,7 +334,9 @@ class Render(bpy.types.Operator):
         if self.seed:
             count = self.settings['seed_count']
 
-            print(f"{prefix} Rendering{quality} {count} times at {resolution} with {samples} samples{threshold} to .{ext}")
+            workers = self.settings['seed_workers']
+
+            print(f"{prefix} Rendering{quality} {count} times at {resolution} with {samples} samples{threshold} to .{ext}{f' using {workers} background workers' if workers > 1 else ''}")
 
         # prepare quick render
         else:
@@ -409,25 +442,56 @@ class Render(bpy.types.Operator):
         scene.use_nodes = self.settings['use_nodes']
         render.use_compositing = self.settings['use_compositing']
 
-        # for seed rendings, but non-final ones, where the seed renderings are kept, and where use_nodes was disabled initially, enable it, otherwise the previews in the compositor won't work
-        if get_prefs().render_keep_seed_renderings and self.seed and not self.final and not scene.use_nodes:
+        # for seed rendings, but non-final ones, that were composited, where the seed renderings are kept, and where use_nodes was disabled initially, enable it, otherwise the previews in the compositor won't work
+        if get_prefs().render_keep_seed_renderings and self.seed and not self.final and self.settings['tree'] and not scene.use_nodes:
             scene.use_nodes = True
 
-    def rename_file_output(self, basename):
+    def time_stage(self, stage, start):
         '''
-        we are using the file ouput node in the compositor to save the result, because it allows us to disable "save_as_render"
-        not doing this, or using img.save_render() again would result in a slight color change, likely because some color shit is applied a second time
-        unfortunately, the file output node, also always adds the frame number at the end, so we'll have to remove that
-        also, the datetime couldn't be set earlier or it would denote the pre-rendering/pre-compositing time
+        record the time passed since start for the passed in stage
+        return the current time, so consecutive stages can be chained
         '''
 
-        scene = self.settings['scene']
+        now = time.perf_counter()
+        self.timings.append((stage, now - start))
+
+        return now
+
+    def get_log_info(self):
+        '''
+        collect the render settings logged along with each stage timing, so throughput can be compared across blend files and blender versions
+        '''
+
+        render = self.settings['render']
+        cycles = self.settings['cycles']
+
+        if self.final:
+            mode = 'final seed' if self.seed else 'final'
+        else:
+            mode = 'seed' if self.seed else 'quick'
+
+        return {'date': datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                'blend': self.settings['blendname'],
+                'blender': bpy.app.version_string,
+                'engine': render.engine,
+                'device': cycles.device,
+                'mode': mode,
+                'resolution': self.strings['resolution_file'],
+                'samples': self.strings['samples_file'],
+                'threshold': self.strings['threshold_file'] if cycles.use_adaptive_sampling else '',
+                'format': self.settings['ext'],
+                'seeds': self.settings['seed_count'] if self.seed else '',
+                'workers': self.settings['seed_workers'] if self.seed else ''}
+
+    def get_timestamped_path(self, basename):
+        '''
+        replace the DATETIME placeholder of a suffix basename with the current time, and return the full path
+        a tiny delay is created, to ensure the time code is later than the one of the previously saved render
+        '''
 
         outpath = self.settings['outpath']
         ext = self.settings['ext']
 
-        comp_path = os.path.join(outpath, f"{basename}{str(scene.frame_current).zfill(4)}.{ext}")
-
         time.sleep(1)
         now = datetime.datetime.now().strftime("%Y-%m-%d_%H:%M:%S")
 
@@ -436,7 +500,24 @@ class Render(bpy.types.Operator):
 
         basename = basename.replace('DATETIME', now)
 
-        save_path = os.path.join(outpath, f"{basename}.{ext}")
+        return os.path.join(outpath, f"{basename}.{ext}")
+
+    def rename_file_output(self, basename):
+        '''
+        we are using the file ouput node in the compositor to save the result, because it allows us to disable "save_as_render"
+        not doing this, or using img.save_render() again would result in a slight color change, likely because some color shit is applied a second time
+        unfortunately, the file output node, also always adds the frame number at the end, so we'll have to remove that
+        also, the datetime couldn't be set earlier or it would denote the pre-rendering/pre-compositing time
+        '''
+
+        scene = self.settings['scene']
+
+        outpath = self.settings['outpath']
+        ext = self.settings['ext']
+
+        comp_path = os.path.join(outpath, f"{basename}{str(scene.frame_current).zfill(4)}.{ext}")
+
+        save_path = self.get_timestamped_path(basename)
         os.rename(comp_path, save_path)
 
         return save_path
@@ -449,6 +530,9 @@ class Render(bpy.types.Operator):
         render out count images, each with a new seed
         '''
 
+        if self.settings['seed_workers'] > 1:
+            return self.seed_render_batch()
+
         count = self.settings['seed_count']
         cycles = self.settings['cycles']
 
@@ -457,6 +541,8 @@ class Render(bpy.types.Operator):
         # collect seeeds and file paths
         seedpaths = []
 
+        stagetime = time.perf_counter()
+
         for i in range(count):
             cycles.seed = i
 
@@ -465,8 +551,11 @@ class Render(bpy.types.Operator):
                 basename = self.get_save_path(suffix='clownmatte' if get_prefs().render_use_clownmatte_naming else 'cryptomatte')
                 self.setup_compositor_for_cryptomatte_export(basename)
 
+                stagetime = self.time_stage('compositor setup', stagetime)
+
             print(" Seed:", cycles.seed)
             bpy.ops.render.render(animation=False, write_still=False, use_viewport=False, layer='', scene='')
+            stagetime = self.time_stage(f"seed {i}", stagetime)
 
             # save seed render
             save_path = self.get_save_path(seed=i)
@@ -478,10 +567,15 @@ class Render(bpy.types.Operator):
                 # clear out compositing
                 self.clear_out_compositor()
 
+                # keep the renaming delay out of the timings
+                stagetime = time.perf_counter()
+
             img = bpy.data.images.get('Render Result')
             img.save_render(filepath=save_path)
             seedpaths.append((i, save_path))
 
+            stagetime = self.time_stage(f"save seed {i}", stagetime)
+
             # temporaryily change the Render Result image name and update the UI as simple progress indication
             img.name = f"Render Seed {i} ({i + 1}/{count})"
             bpy.ops.wm.redraw_timer(type='DRAW_WIN_SWAP', iterations=1)
@@ -489,6 +583,125 @@ class Render(bpy.types.Operator):
 
         return seedpaths, matte_path
 
+    def seed_render_batch(self):
+        '''
+        render out count images, each with a new seed, distributed across multiple background blender processes
+        the current state of the file is saved to a temporary copy next to the blend file, so relative paths keep working, which requires the file to be saved
+        the available cpu threads are split among the workers, and each worker reports back every finished seed via stdout
+        for final renders, the cryptomatte is exported by the worker rendering the last seed, the same as when rendering sequentially, and only that seed renders the cryptomatte passes
+        '''
+
+        count = self.settings['seed_count']
+        workers = self.settings['seed_workers']
+
+        matte_path = None
+
+        stagetime = time.perf_counter()
+
+        # collect seeds and file paths up front, as they are passed to the workers
+        seedpaths = [(i, self.get_save_path(seed=i)) for i in range(count)]
+
+        # the cryptomatte pass states, as set up by the user, which the workers use for all seeds, except the one exporting the cryptomatte
+        view_layer = self.settings['view_layer']
+        crypto_passes = [view_layer.use_pass_cryptomatte_object, view_layer.use_pass_cryptomatte_material, view_layer.use_pass_cryptomatte_asset]
+
+        # for final renders, set up the compositor for cryptomatte export, before the file is copied to the workers
+        if self.final:
+            basename = self.get_save_path(suffix='clownmatte' if get_prefs().render_use_clownmatte_naming else 'cryptomatte')
+            self.setup_compositor_for_cryptomatte_export(basename)
+
+            stagetime = self.time_stage('compositor setup', stagetime)
+
+        blendpath = os.path.join(os.path.dirname(bpy.data.filepath), f".{self.settings['blendname']}_seed_render.blend")
+
+        # distribute the seeds, only compositing the last one, and only for final renders
+        jobs = [[] for _ in range(workers)]
+
+        for i, path in seedpaths:
+            jobs[i % workers].append((i, path, self.final and i == count - 1))
+
+        threads = max(1, (os.cpu_count() or workers) // workers)
+
+        processes = []
+        messages = queue.Queue()
+
+        done = 0
+        output = {idx: [] for idx in range(workers)}
+
+        # ensure the workers are stopped and the temporary copy is removed, even if the dispatch fails or is aborted
+        try:
+
+            # save a copy of the current state, including the adjusted render settings
+            bpy.ops.wm.save_as_mainfile(filepath=blendpath, copy=True)
+
+            stagetime = self.time_stage('dispatch', stagetime)
+
+            print(f" Dispatching {count} seeds to {workers} workers with {threads} threads each")
+
+            for idx, job in enumerate(jobs):
+                args = {'view_layer': view_layer.name, 'crypto_passes': crypto_passes, 'jobs': job}
+
+                cmd = [bpy.app.binary_path, '-b', blendpath, '-t', str(threads), '--python-expr', seed_worker_script, '--', json.dumps(args)]
+                process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, encoding='utf-8', errors='replace', bufsize=1)
+
+                reader = threading.Thread(target=read_worker_output, args=(process, idx, messages), daemon=True)
+                reader.start()
+
+                processes.append((process, reader))
+
+            # stream progress back from the workers, until all of them have finished, timing each seed from the worker's previous one
+            workertimes = {idx: stagetime for idx in range(workers)}
+
+            while any(reader.is_alive() for _, reader in processes) or not messages.empty():
+                try:
+                    idx, line = messages.get(timeout=0.1)
+
+                except queue.Empty:
+                    continue
+
+                if line.startswith('M3_SEED_RENDERED'):
+                    done += 1
+                    seed = line.split()[1]
+
+                    workertimes[idx] = self.time_stage(f"seed {seed}", workertimes[idx])
+                    print(f" Seed: {seed} ({done}/{count}) on worker {idx}")
+
+                    # update the UI as simple progress indication
+                    bpy.ops.wm.redraw_timer(type='DRAW_WIN_SWAP', iterations=1)
+
+                else:
+                    output[idx].append(line)
+
+        finally:
+            for process, reader in processes:
+                if process.poll() is None:
+                    process.kill()
+
+                process.wait()
+                reader.join()
+
+            if os.path.exists(blendpath):
+                os.remove(blendpath)
+
+        failed = [idx for idx, (process, _) in enumerate(processes) if process.returncode != 0]
+
+        if failed or done < count:
+            for idx in failed or range(workers):
+                print(f"\nWorker {idx} output:")
+                print("".join(output[idx][-20:]))
+
+            print(f"\nSeed rendering failed, only {done}/{count} seeds were rendered")
+            return None, None
+
+        # remove the frame number from the composed cryptomatte and properly set the datetime
+        if self.final:
+            matte_path = self.rename_file_output(basename)
+
+            # clear out compositing
+            self.clear_out_compositor()
+
+        return seedpaths, matte_path
+
     def load_seed_renderings(self, seedpaths):
         '''
         load the previously saved seed renderings
@@ -506,78 +719,107 @@ class Render(bpy.types.Operator):
 
         return images
 
-    def setup_compositor_for_firefly_removal(self, images, basename):
+    def combine_seed_renderings(self, images, seedpaths, basename):
         '''
-        setup compositing node tree, combining the individual seed renderings using darke mix mode to remove fireflies
+        combine the seed renderings per pixel in memory, removing fireflies, and save the result without rendering the scene again
+        the seed images are only kept if the seed renderings are supposed to be kept, in which case they are added to the compositor too, like before
         '''
 
         count = self.settings['seed_count']
-        scene = self.settings['scene']
-        render = self.settings['render']
-        tree = self.settings['tree']
-        outpath = self.settings['outpath']
+        mode = get_prefs().render_seed_combine
 
-        print(f"\nCompositing {count} Renders")
+        print(f"\nCombining {count} Renders using the {'Median' if mode == 'MEDIAN' else 'Minimum'}")
 
-        # enable compositing, to save out the combined pass using the file output node
-        scene.render.use_compositing = True
+        stagetime = time.perf_counter()
+
+        pixels, stored = combine_seed_images(images, [path for _, path in seedpaths], mode=mode)
+        stagetime = self.time_stage('composite', stagetime)
+
+        save_path = self.save_combined_via_compositor(images, pixels, stored, basename)
+        self.time_stage('save', stagetime)
 
-        imgnodes = []
-        mixnodes = []
+        if not get_prefs().render_keep_seed_renderings:
+            for img in images:
+                bpy.data.images.remove(img)
 
-        # setup the compositor tree to combine the renderings, removing the fireflies
-        for idx, img in enumerate(images):
-            imgnode = tree.nodes.new('CompositorNodeImage')
-            imgnode.image = img
-            imgnodes.append(imgnode)
+        return save_path
 
-            imgnode.location.x = idx * 200
+    def save_combined_via_compositor(self, images, pixels, stored, basename):
+        '''
+        setup compositing node tree, saving out the combined pixels using the file output node
+        the file output node is initialized with the scene's output settings, so file format, color depth, codec and so on are those of a regular render
+        like before, "save_as_render" is disabled, as the seed renderings have been color managed already
+        without any render layers node in the tree, rendering only runs the compositor, and doesn't render the scene again
+        as the renaming delay is part of it, this is timed as part of the save stage
+        '''
 
-            if idx < count - 1:
-                mixnode = tree.nodes.new('CompositorNodeMixRGB')
-                mixnode.blend_type = 'DARKEN'
-                mixnodes.append(mixnode)
+        scene = self.settings['scene']
+        outpath = self.settings['outpath']
 
-                mixnode.location.x = 400 + idx * 200
-                mixnode.location.y = 300
+        # clear out compositing nodes, and remove potential previous seed renderings
+        self.clear_out_compositor()
+        tree = self.settings['tree']
 
-            if idx == 0:
-                tree.links.new(imgnode.outputs[0], mixnode.inputs[1])
-            else:
-                tree.links.new(imgnode.outputs[0], mixnodes[idx - 1].inputs[2])
+        # enable compositing, to save out the combined pass using the file output node
+        scene.render.use_compositing = True
 
-                if idx < count - 1:
-                    tree.links.new(mixnodes[idx - 1].outputs[0], mixnodes[idx].inputs[1])
+        height, width, _ = pixels.shape
 
-            if idx == count - 1:
-                compnode = tree.nodes.new('CompositorNodeComposite')
+        img = bpy.data.images.new('Seed Render', width, height, alpha=True, float_buffer=True)
 
-                compnode.location.x = imgnode.location.x + 500
-                compnode.location.y = 150
+        # the stored values of non-float seed files are still encoded in their colorspace, while float buffers are linear already, like the new image
+        if stored:
+            img.colorspace_settings.name = images[0].colorspace_settings.name
 
-                viewnode = tree.nodes.new('CompositorNodeViewer')
-                viewnode.location.x = imgnode.location.x + 500
-                viewnode.location.y = 300
+        img.pixels.foreach_set(pixels.ravel())
 
-                tree.links.new(mixnodes[-1].outputs[0], compnode.inputs[0])
-                tree.links.new(mixnodes[-1].outputs[0], viewnode.inputs[0])
+        imgnode = tree.nodes.new('CompositorNodeImage')
+        imgnode.image = img
 
+        compnode = tree.nodes.new('CompositorNodeComposite')
+        compnode.location.x = 400
+        compnode.location.y = 150
+
+        viewnode = tree.nodes.new('CompositorNodeViewer')
+        viewnode.location.x = 400
+        viewnode.location.y = 300
+
+        tree.links.new(imgnode.outputs[0], compnode.inputs[0])
+        tree.links.new(imgnode.outputs[0], viewnode.inputs[0])
 
         # add file output node
         outputnode = tree.nodes.new('CompositorNodeOutputFile')
-        outputnode.location.x = compnode.location.x
+        outputnode.location.x = 400
 
-        tree.links.new(mixnodes[-1].outputs[0], outputnode.inputs[0])
+        tree.links.new(imgnode.outputs[0], outputnode.inputs[0])
 
-        if render.image_settings.file_format == 'OPEN_EXR_MULTILAYER':
-            outputnode.base_path = os.path.join(outpath, basename)
-        else:
-            outputnode.base_path = outpath
+        outputnode.base_path = os.path.join(outpath, basename)
 
         output = outputnode.file_slots[0]
         output.path = basename
         output.save_as_render = False
 
+        # add the kept seed renderings too, so they can be previewed in the compositor
+        if get_prefs().render_keep_seed_renderings:
+            for idx, seedimg in enumerate(images):
+                seednode = tree.nodes.new('CompositorNodeImage')
+                seednode.image = seedimg
+
+                seednode.location.x = -300
+                seednode.location.y = -300 * idx
+
+        # render compositor
+        bpy.ops.render.render(animation=False, write_still=False, use_viewport=False, layer='', scene='')
+
+        # remove the frame number from the composed image, and properly set the datetime
+        save_path = self.rename_file_output(basename)
+
+        # clear out the compositor too, unless the seed renderings are kept, but note that when final is enabled this happens anyway
+        if not get_prefs().render_keep_seed_renderings and not self.final:
+            self.clear_out_compositor()
+
+        return save_path
+
 
     # FINAL
 
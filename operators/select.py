@@ -1,6 +1,6 @@
 import bpy
-from bpy.props import EnumProperty
-from mathutils import Vector
+from bpy.props import EnumProperty, BoolProperty
+import numpy as np
 
 
 axis_items = [("0", "X", ""),
@@ -15,6 +15,7 @@ class SelectCenterObjects(bpy.types.Operator):
     bl_options = {'REGISTER', 'UNDO'}
 
     axis: EnumProperty(name="Axis", items=axis_items, default="0")
+    vertices: BoolProperty(name="Test Vertices", description="Only select Objects, whose evaluated Vertices actually lie on both Sides of the Axis, not just their Bounding Boxes", default=False)
 
     def draw(self, context):
         layout = self.layout
@@ -24,6 +25,9 @@ class SelectCenterObjects(bpy.types.Operator):
         row = column.row()
         row.prop(self, "axis", expand=True)
 
+        row = column.row()
+        row.prop(self, "vertices", toggle=True)
+
     @classmethod
     def poll(cls, context):
         return context.mode == 'OBJECT'
@@ -32,16 +36,33 @@ class SelectCenterObjects(bpy.types.Operator):
         visible = [obj for obj in context.visible_objects if obj.type == "MESH"]
 
         if visible:
+            axis = int(self.axis)
+
+            for obj in context.selected_objects:
+                obj.select_set(False)
+
+            # only the world space coordinate along the axis is needed, so a single row of each world matrix is enough
+            rows = np.array([obj.matrix_world.row[axis] for obj in visible], dtype=np.float64)
+            bboxes = np.array([obj.bound_box for obj in visible], dtype=np.float64)
+
+            coords = np.einsum('nij,nj->ni', bboxes, rows[:, :3]) + rows[:, 3:]
+            center = (coords.min(axis=1) < 0) & (coords.max(axis=1) > 0)
+
+            # straddling bounding boxes are a precondition for straddling vertices, so only their objects need to be tested
+            if self.vertices:
+                dg = context.evaluated_depsgraph_get()
 
-            bpy.ops.object.select_all(action='DESELECT')
+                for idx in center.nonzero()[0]:
+                    mesh = visible[idx].evaluated_get(dg).data
 
-            for obj in visible:
-                mx = obj.matrix_world
+                    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+                    mesh.vertices.foreach_get('co', coords)
 
-                coords = [(mx @ Vector(co))[int(self.axis)] for co in obj.bound_box]
+                    coords = coords.reshape(-1, 3) @ rows[idx, :3] + rows[idx, 3]
+                    center[idx] = coords.min() < 0 < coords.max()
 
-                if min(coords) < 0 and max(coords) > 0:
-                    obj.select_set(True)
+            for idx in center.nonzero()[0]:
+                visible[idx].select_set(True)
 
         return {'FINISHED'}
 
@@ -289,6 +289,10 @@ class SmartEdge(bpy.types.Operator):
         if not verts or len(faces) == len(bm.faces):
             return False
 
+        # sets make the membership tests constant time, so this only depends on the size of the selection
+        edges = set(edges)
+        faces = set(faces)
+
         # check for each selected vert, if every connected edge or face is also selected
         for v in verts:
             if not all(e in edges for e in v.link_edges):
@@ -3,6 +3,7 @@ from bpy.props import BoolProperty
 import bmesh
 from .. utils.view import update_local_view
 from .. utils.registration import get_prefs
+from .. utils.graph import get_mesh_adjacency, invalidate_mesh_adjacency, sync_edit_mesh
 
 
 class SmartFace(bpy.types.Operator):
@@ -147,7 +148,14 @@ class SmartFace(bpy.types.Operator):
 
                 # automatically merge the newly created vert to the closest non manifold vert if it's closer than the 2 other verts are
                 if self.automerge:
-                    nonmanifoldverts = [v for v in bm.verts if any([not e.is_manifold for e in v.link_edges]) and v not in [vs, v_new, v1_other, v2_other]]
+
+                    # the new face changed the topology, which the depsgraph only reports after the operator has finished
+                    invalidate_mesh_adjacency(active.data)
+
+                    sync_edit_mesh(active, bm)
+                    adjacency = get_mesh_adjacency(active.data)
+                    nonmanifoldverts = [bm.verts[idx] for idx in adjacency.get_non_manifold_verts().nonzero()[0]]
+                    nonmanifoldverts = [v for v in nonmanifoldverts if v not in [vs, v_new, v1_other, v2_other]]
 
                     if nonmanifoldverts:
                         distance = min([((v_new.co - v.co).length, v) for v in nonmanifoldverts], key=lambda x: x[0])
@@ -6,7 +6,7 @@ from mathutils import Vector
 from mathutils.geometry import intersect_point_line, intersect_line_line, intersect_line_plane
 from .. utils.graph import get_shortest_path
 from .. utils.ui import popup_message, init_status, finish_status
-from .. utils.draw import draw_line, draw_lines, draw_point, draw_tris, draw_vector
+from .. utils.draw import draw_line, draw_point, draw_vector, DrawBatch
 from .. utils.snap import Snap
 from .. utils.math import average_locations, get_center_between_verts, get_face_center
 from .. utils.selection import get_edges_vert_sequences, get_selection_islands
@@ -117,27 +117,30 @@ class SmartVert(bpy.types.Operator):
     def draw_VIEW3D(self):
 
         # draw slide vectors
-        if self.coords:
-            draw_lines(self.coords, mx=self.mx, color=(0.5, 1, 0.5), width=2, alpha=0.5)
+        self.batches['slide'].draw()
 
         # draw snap coords
         if self.is_snapping:
             if self.snap_element == 'EDGE':
-                if self.snap_coords:
-                    draw_lines(self.snap_coords, color=(1, 0, 0), width=3, alpha=0.75)
+                self.batches['snap'].draw()
+                self.batches['proximity'].draw()
+                self.batches['ortho'].draw()
 
-                if self.snap_proximity_coords:
-                    draw_lines(self.snap_proximity_coords, mx=self.mx, color=(1, 0, 0), width=1, alpha=0.3)
+            elif self.snap_element == 'FACE':
+                self.batches['tris'].draw()
+                self.batches['ortho'].draw()
 
-                if self.snap_ortho_coords:
-                    draw_lines(self.snap_ortho_coords, mx=self.mx, color=(1, 0.7, 0), width=1, alpha=0.3)
+    def update_batches(self):
+        '''
+        rebuild the batches of the slide and snap coords, but only those whose coords have actually changed
+        the coords are copied, as the slide coords reference the vert locations of the bmesh directly
+        '''
 
-            elif self.snap_element == 'FACE':
-                if self.snap_tri_coords:
-                    draw_tris(self.snap_tri_coords, color=(1, 0, 0), alpha=0.1)
+        for name, coords in [('slide', self.coords), ('snap', self.snap_coords), ('proximity', self.snap_proximity_coords), ('ortho', self.snap_ortho_coords), ('tris', self.snap_tri_coords)]:
+            batch = self.batches[name]
 
-                if self.snap_ortho_coords:
-                    draw_lines(self.snap_ortho_coords, mx=self.mx, color=(1, 0.7, 0), width=1, alpha=0.3)
+            if len(coords) != len(batch.coords) or any(co != batchco for co, batchco in zip(coords, batch.coords)):
+                batch.update(coords=[co.copy() for co in coords])
 
     def modal(self, context, event):
         context.area.tag_redraw()
@@ -200,6 +203,7 @@ class SmartVert(bpy.types.Operator):
 
                 self.slide(context)
 
+        self.update_batches()
 
 
         # VIEWPORT control
@@ -465,6 +469,10 @@ class SmartVert(bpy.types.Operator):
                 # init snapping
                 self.S = Snap(context, alternative=[self.active], debug=False)
 
+                # cache the likely snapping targets while idle, the alternative first, including its bmesh, then the objects closest to the mouse
+                self.S.prewarm(context, objects=self.S.alternative, create_bmesh=True)
+                self.S.prewarm(context, mousepos=self.mousepos)
+
                 self.is_snapping = False
                 self.is_diverging = False
                 self.snap_element = None
@@ -473,6 +481,13 @@ class SmartVert(bpy.types.Operator):
                 self.snap_proximity_coords = []
                 self.snap_ortho_coords = []
 
+                # the batches are drawn on every redraw, but only rebuilt, when their coords change
+                self.batches = {'slide': DrawBatch('LINES', mx=self.mx, color=(0.5, 1, 0.5), width=2, alpha=0.5),
+                                'snap': DrawBatch('LINES', color=(1, 0, 0), width=3, alpha=0.75),
+                                'proximity': DrawBatch('LINES', mx=self.mx, color=(1, 0, 0), width=1, alpha=0.3),
+                                'ortho': DrawBatch('LINES', mx=self.mx, color=(1, 0.7, 0), width=1, alpha=0.3),
+                                'tris': DrawBatch('TRIS', color=(1, 0, 0), alpha=0.1)}
+
                 # statusbar
                 init_status(self, context, func=draw_slide_status(self))
 
@@ -3,7 +3,7 @@ from bpy.props import IntProperty, StringProperty, BoolProperty, EnumProperty, F
 import os
 from . utils.ui import get_icon, draw_keymap_items
 from . utils.registration import activate, get_path, get_name, get_addon
-from . items import preferences_tabs, matcap_background_type_items
+from . items import preferences_tabs, matcap_background_type_items, render_seed_combine_items
 
 
 decalmachine = None
@@ -304,7 +304,10 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
 
     render_folder_name: StringProperty(name="Render Folder Name", description="Folder used to stored rended images relative to the Location of the .blend file", default='out')
     render_seed_count: IntProperty(name="Seed Render Count", description="Set the Amount of Seed Renderings used to remove Fireflies", default=3, min=2, max=9)
+    render_seed_workers: IntProperty(name="Seed Render Workers", description="Render Seeds in the specified Amount of Background Blender Processes, splitting the available CPU Threads among them\n1: Render all Seeds in the current Session", default=1, min=1, max=9)
+    render_seed_combine: EnumProperty(name="Seed Render Combine", description="Method used to combine the individual Seed Renderings", items=render_seed_combine_items, default="MIN")
     render_keep_seed_renderings: BoolProperty(name="Keep Individual Renderings", description="Keep the individual Seed Renderings, after they've been combined into a single Image", default=False)
+    render_log_timings: BoolProperty(name="Log Render Timings", description="Log the Time of each Render Stage to render_log.csv in the Render Folder", default=False)
     render_use_clownmatte_naming: BoolProperty(name="Use Clownmatte Name", description="""It's a better name than "Cryptomatte", believe me""", default=True)
     render_show_buttons_in_light_properties: BoolProperty(name="Show Render Buttons in Light Properties Panel", description="Show Render Buttons in Light Properties Panel", default=True)
     render_sync_light_visibility: BoolProperty(name="Sync Light visibility/renderability", description="Sync Light hide_render props based on hide_viewport props", default=True)
@@ -387,6 +390,12 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
     activate_tools_pie: BoolProperty(name="Tools Pie", default=False, update=update_activate_tools_pie)
 
 
+    # REGISTRATION
+
+    lazy_pie_registration: BoolProperty(name="Lazy Pie Registration", description="Only import the Pie Menus, once one is opened for the first time, to speed up Blender's startup\nTakes effect after a restart", default=False)
+    show_registration_timings: BoolProperty(name="Report Registration Timings", description="Print the time it took to register each Tool and Pie Menu to the terminal, on startup", default=False)
+
+
     # SUB MENUS
 
     use_group_sub_menu: BoolProperty(name="Use Group Sub-Menu", default=False)
@@ -397,6 +406,7 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
 
     show_sidebar_panel: BoolProperty(name="Show Sidebar Panel", description="Show MACHIN3tools Panel in 3D View's Sidebar", default=True)
     use_legacy_line_smoothing: BoolProperty(name="Use Legacy Line Smoothing", description="Legacy Line Smoothing using the depreciated bgl module\nIf this is disabled, lines drawn by MACHIN3tools won't be anti aliased.", default=False)
+    bvh_cache_budget: IntProperty(name="BVH Cache Budget (MB)", description="Memory available for caching BVH trees used for ray casting, least recently used ones are freed once it's exceeded", default=256, min=0)
 
 
     # HUD
@@ -602,6 +612,16 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
         row.label(text="Switch Tools, used primarily for BoxCutter/HardOps.")
 
 
+        # REGISTRATION
+
+        bb = b.box()
+        bb.label(text="Registration")
+
+        column = bb.column()
+        column.prop(self, "lazy_pie_registration")
+        column.prop(self, "show_registration_timings")
+
+
         # RIGHT
 
         b = split.box()
@@ -673,6 +693,15 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
             column = bb.column()
             column.prop(self, "focus_lights")
 
+        # MATERIAL PICKER
+
+        if getattr(bpy.types, "MACHIN3_OT_material_picker", False):
+            bb = b.box()
+            bb.label(text="Material Picker")
+
+            column = bb.column()
+            column.prop(self, "bvh_cache_budget")
+
         # GROUP
 
         if getattr(bpy.types, "MACHIN3_OT_group", False):
@@ -775,11 +804,26 @@ class MACHIN3toolsPreferences(bpy.types.AddonPreferences):
             r.prop(self, "render_seed_count", text="")
             r.label(text="Seed Render Count")
 
+            row = column.row(align=True)
+            r = row.split(factor=0.2, align=True)
+            r.prop(self, "render_seed_workers", text="")
+            r.label(text="Seed Render Workers (background processes, 1 renders in the current session)")
+
+            row = column.row(align=True)
+            r = row.split(factor=0.2, align=True)
+            r.prop(self, "render_seed_combine", text="")
+            r.label(text="Seed Render Combine Method")
+
             row = column.row(align=True)
             r = row.split(factor=0.2, align=True)
             r.prop(self, "render_keep_seed_renderings", text="True" if self.render_keep_seed_renderings else "False", toggle=True)
             r.label(text="Keep Individual Seed Renderings")
 
+            row = column.row(align=True)
+            r = row.split(factor=0.2, align=True)
+            r.prop(self, "render_log_timings", text="True" if self.render_log_timings else "False", toggle=True)
+            r.label(text="Log Render Stage Timings to render_log.csv in the Render Folder")
+
             row = column.row(align=True)
             r = row.split(factor=0.2, align=True)
             r.prop(self, "render_use_clownmatte_naming", text="True" if self.render_use_clownmatte_naming else "False", toggle=True)
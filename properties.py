@@ -9,6 +9,7 @@ from . utils.registration import get_prefs, get_addon_prefs
 from . utils.tools import get_active_tool
 from . utils.light import adjust_lights_for_rendering, get_area_light_poll
 from . utils.view import sync_light_visibility
+from . utils.group import reset_group_registry
 from . items import eevee_preset_items, align_mode_items, render_engine_items, cycles_device_items, driver_limit_items, axis_items, driver_transform_items, driver_space_items, bc_orientation_items, shading_light_items
 
 
@@ -490,6 +491,9 @@ class M3SceneProperties(bpy.types.PropertyGroup):
 
                 e.empty_display_size = 0.0001
 
+        # the states set here differ from the ones the group handler has applied last
+        reset_group_registry()
+
     def update_affect_only_group_origin(self, context):
         if self.affect_only_group_origin:
             context.scene.tool_settings.use_transform_skip_children = True
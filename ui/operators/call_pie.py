@@ -1,17 +1,24 @@
 import bpy
 from bpy.props import StringProperty
+from ... utils.ui import set_pie_state
 
 
 class CallMACHIN3toolsPie(bpy.types.Operator):
     bl_idname = "machin3.call_machin3tools_pie"
     bl_label = "MACHIN3: Call MACHIN3tools Pie"
-    bl_options = {'REGISTER', 'UNDO'}
 
     idname: StringProperty()
 
     def invoke(self, context, event):
         if context.space_data.type == 'VIEW_3D':
 
+            # snapshot the state the pie is drawn from once, so it can be reused for all redraws, as long as the pie is open
+            # NOTE: lazily registered pies only get their get_state() method on first draw, and will get their state then
+            pie = getattr(bpy.types, f'MACHIN3_MT_{self.idname}', None)
+
+            if pie and hasattr(pie, 'get_state'):
+                set_pie_state(context, pie)
+
             # SHADING PIE
 
             if self.idname == 'shading_pie':
@@ -49,4 +56,9 @@ class CallMACHIN3toolsPie(bpy.types.Operator):
                 else:
                     return {'PASS_THROUGH'}
 
+            # COLLECTIONS PIE
+
+            elif self.idname == 'collections_pie':
+                bpy.ops.wm.call_menu_pie(name='MACHIN3_MT_%s' % (self.idname))
+
         return {'FINISHED'}
@@ -1,5 +1,8 @@
 import bpy
-from ... utils.raycast import get_closest
+from bpy.props import BoolProperty
+import numpy as np
+from time import perf_counter
+from ... utils.raycast import get_world_bvh
 
 
 class ShrinkwrapGreasePencil(bpy.types.Operator):
@@ -8,27 +11,77 @@ class ShrinkwrapGreasePencil(bpy.types.Operator):
     bl_description = "Shrinkwrap current Grease Pencil Layer to closest mesh surface based on Surface Offset value"
     bl_options = {'REGISTER', 'UNDO'}
 
+    all_layers: BoolProperty(name="All Layers", description="Shrinkwrap all unlocked and visible Layers, not just the active one", default=False)
+    all_frames: BoolProperty(name="All Frames", description="Shrinkwrap all Frames, not just the active one", default=False)
+
     @classmethod
     def poll(cls, context):
         active = context.active_object
         if active and active.type == 'GPENCIL':
             return active.data.layers.active
 
+    def draw(self, context):
+        layout = self.layout
+
+        row = layout.row(align=True)
+        row.prop(self, 'all_layers', toggle=True)
+        row.prop(self, 'all_frames', toggle=True)
+
     def execute(self, context):
+        starttime = perf_counter()
+
         dg = context.evaluated_depsgraph_get()
 
         gp = context.active_object
-        mx = gp.matrix_world
+        mx = np.array(gp.matrix_world)
+        mxi = np.array(gp.matrix_world.inverted_safe())
         offset = gp.data.zdepth_offset
 
-        layer = gp.data.layers.active
-        frame = layer.active_frame
+        # build a single world space BVH of all the visible meshes once, instead of querying each mesh for each point
+        bvh = get_world_bvh([obj for obj in context.visible_objects if obj.type == 'MESH'], dg)
+
+        if not bvh:
+            return {'CANCELLED'}
+
+        # like in the viewport, locked and hidden layers are left alone
+        layers = [layer for layer in gp.data.layers if not (layer.lock or layer.hide)] if self.all_layers else [gp.data.layers.active]
+        frames = [frame for layer in layers for frame in (layer.frames if self.all_frames else [layer.active_frame]) if frame]
+        strokes = [stroke for frame in frames for stroke in frame.strokes if stroke.points]
+
+        if not strokes:
+            return {'CANCELLED'}
+
+        # pull the point coords of all strokes into a single array
+        counts = [len(stroke.points) for stroke in strokes]
+        coords = np.empty((sum(counts), 3), dtype=np.float64)
+
+        start = 0
+
+        for stroke, count in zip(strokes, counts):
+            stroke.points.foreach_get('co', np.reshape(coords[start:start + count], count * 3))
+            start += count
+
+        # find the closest surface point of each stroke point in world space
+        world_coords = coords @ mx[:3, :3].T + mx[:3, 3]
+
+        for idx, co in enumerate(world_coords.tolist()):
+            location, normal, _, _ = bvh.find_nearest(co)
+
+            if location:
+                world_coords[idx] = location + normal * offset
+
+        # bring them back into the grease pencil's local space, and push them back into the strokes
+        coords = world_coords @ mxi[:3, :3].T + mxi[:3, 3]
+
+        start = 0
+
+        for stroke, count in zip(strokes, counts):
+            stroke.points.foreach_set('co', np.reshape(coords[start:start + count], count * 3))
+            start += count
 
-        for stroke in frame.strokes:
-            for idx, point in enumerate(stroke.points):
-                closest, _, co, no, _, _ = get_closest(mx @ point.co, depsgraph=dg, debug=False)
+        gp.data.update_tag()
 
-                if closest:
-                    point.co = mx.inverted_safe() @ (co + no * offset)
+        duration = perf_counter() - starttime
+        self.report({'INFO'}, f"Shrinkwrapped {len(coords)} points in {duration:.2f}s ({len(coords) / max(duration, 0.000001):.0f} points/s)")
 
         return {'FINISHED'}
@@ -3,8 +3,8 @@ from bpy.types import Menu
 import os
 import importlib
 from .. utils.registration import get_prefs, get_addon
-from .. utils.ui import get_icon
-from .. utils.collection import get_scene_collections
+from .. utils.ui import get_icon, get_pie_state, pie_draw_timer
+from .. utils.collection import get_scene_collections, get_collection_key
 from .. utils.system import abspath
 from .. utils.tools import get_tools_from_context, get_active_tool
 from .. utils.light import get_area_light_poll
@@ -31,6 +31,7 @@ class PieModes(Menu):
     bl_idname = "MACHIN3_MT_modes_pie"
     bl_label = "Modes"
 
+    @pie_draw_timer
     def draw(self, context):
         layout = self.layout
         toolsettings = context.tool_settings
@@ -698,6 +699,7 @@ class PieSave(Menu):
     bl_idname = "MACHIN3_MT_save_pie"
     bl_label = "Save, Open, Append"
 
+    @pie_draw_timer
     def draw(self, context):
         layout = self.layout
         pie = layout.menu_pie()
@@ -824,6 +826,15 @@ class PieShading(Menu):
     bl_idname = "MACHIN3_MT_shading_pie"
     bl_label = "Shading and Overlays"
 
+    @staticmethod
+    def get_state(context):
+        '''
+        get_area_light_poll() goes through all objects in the file, so only do it once per invocation
+        '''
+
+        return {'light_adjust': bool(get_prefs().activate_render and get_prefs().render_adjust_lights_on_render and get_area_light_poll())}
+
+    @pie_draw_timer
     def draw(self, context):
         layout = self.layout
 
@@ -884,7 +895,7 @@ class PieShading(Menu):
             elif view.shading.type == 'RENDERED' and context.scene.render.engine == 'CYCLES':
                 self.draw_cycles_box(context, view, b)
 
-            if get_prefs().activate_render and get_prefs().render_adjust_lights_on_render and get_area_light_poll():
+            if get_pie_state(context, self)['light_adjust']:
                 self.draw_light_adjust_box(context, m3, b)
 
 
@@ -1440,6 +1451,7 @@ class PieViewport(Menu):
     bl_idname = "MACHIN3_MT_viewport_pie"
     bl_label = "Viewport and Cameras"
 
+    @pie_draw_timer
     def draw(self, context):
         layout = self.layout
         pie = layout.menu_pie()
@@ -1584,6 +1596,7 @@ class PieAlign(Menu):
     bl_idname = "MACHIN3_MT_align_pie"
     bl_label = "Align"
 
+    @pie_draw_timer
     def draw(self, context):
         layout = self.layout
         pie = layout.menu_pie()
@@ -1863,6 +1876,7 @@ class PieUVAlign(Menu):
     bl_idname = "MACHIN3_MT_uv_align_pie"
     bl_label = "UV Align"
 
+    @pie_draw_timer
     def draw(self, context):
         layout = self.layout
         pie = layout.menu_pie()
@@ -1982,6 +1996,7 @@ class PieCursor(Menu):
     bl_idname = "MACHIN3_MT_cursor_pie"
     bl_label = "Cursor and Origin"
 
+    @pie_draw_timer
     def draw(self, context):
         layout = self.layout
         pie = layout.menu_pie()
@@ -2092,6 +2107,7 @@ class PieTransform(Menu):
     bl_idname = "MACHIN3_MT_transform_pie"
     bl_label = "Transform"
 
+    @pie_draw_timer
     def draw(self, context):
         layout = self.layout
         pie = layout.menu_pie()
@@ -2220,6 +2236,7 @@ class PieSnapping(Menu):
     bl_idname = "MACHIN3_MT_snapping_pie"
     bl_label = "Snapping"
 
+    @pie_draw_timer
     def draw(self, context):
         layout = self.layout
         pie = layout.menu_pie()
@@ -2331,13 +2348,21 @@ class PieCollections(Menu):
     bl_idname = "MACHIN3_MT_collections_pie"
     bl_label = "Collections"
 
-    def draw(self, context):
+    @staticmethod
+    def get_state(context):
+        '''
+        collect the scene or selection collections once per invocation, instead of on every redraw of the pie
+        no bpy data is kept in the state, the collections are stored by their (name, library) keys and resolved again when drawing
+        '''
+
         sel = context.selected_objects
-        active = context.active_object
 
         batchops, _, _, _ = get_addon("Batch Operations™")
         decalmachine, _, _, _ = get_addon("DECALmachine")
 
+        decalparentcollections = []
+        dcol = None
+
         if sel:
             collections = list(set(col for obj in sel for col in obj.users_collection if not (decalmachine and (col.DM.isdecaltypecol or col.DM.isdecalparentcol))))[:10]
 
@@ -2360,7 +2385,32 @@ class PieCollections(Menu):
             decalsname = ".Decals" if context.scene.DM.hide_decaltype_collections else "Decals"
             dcol = bpy.data.collections.get(decalsname)
 
+        return {'sel': bool(sel),
+                'batchops': batchops,
+                'decalmachine': decalmachine,
+                'collections': [get_collection_key(context, col) for col in collections],
+                'decalparentcollections': [get_collection_key(context, col) for col in decalparentcollections],
+                'dcol': get_collection_key(context, dcol) if dcol else None}
 
+    @staticmethod
+    def resolve_collections(context, keys):
+        '''
+        resolve the collection keys stored in the state, skipping collections, that have been removed since
+        '''
+
+        collections = [context.scene.collection if key is None else bpy.data.collections.get(key) for key in keys]
+        return [col for col in collections if col]
+
+    @pie_draw_timer
+    def draw(self, context):
+        state = get_pie_state(context, self)
+
+        sel = state['sel']
+        batchops = state['batchops']
+        decalmachine = state['decalmachine']
+        collections = self.resolve_collections(context, state['collections'])
+        decalparentcollections = self.resolve_collections(context, state['decalparentcollections'])
+        dcol = bpy.data.collections.get(state['dcol']) if state['dcol'] else None
 
         layout = self.layout
         pie = layout.menu_pie()
@@ -2673,6 +2723,7 @@ class PieWorkspace(Menu):
     bl_idname = "MACHIN3_MT_workspace_pie"
     bl_label = "Workspaces"
 
+    @pie_draw_timer
     def draw(self, context):
         layout = self.layout
         pie = layout.menu_pie()
@@ -2725,6 +2776,11 @@ class PieTools(Menu):
     bl_idname = "MACHIN3_MT_tools_pie"
     bl_label = "Tools"
 
+    @staticmethod
+    def get_state(context):
+        return {'tools': get_tools_from_context(context)}
+
+    @pie_draw_timer
     def draw(self, context):
         layout = self.layout
         pie = layout.menu_pie()
@@ -2743,8 +2799,9 @@ class PieTools(Menu):
         if hypercursor is None:
             hypercursor = get_addon("HyperCursor")[0]
 
-        # fetch all current tools
-        tools = get_tools_from_context(context)
+        # fetch all current tools, the active one can change without anything the state is keyed by changing, so it's fetched on every draw
+        tools = get_pie_state(context, self)['tools']
+        active_tool = get_active_tool(context).idname
 
         if context.mode in ['OBJECT', 'EDIT_MESH']:
 
@@ -2753,7 +2810,7 @@ class PieTools(Menu):
                 tool = tools[boxcutter]
                 # NOTE: without adding the spaces, the icon will overlap the text, but only for my own op, not for wm.tool_set_by_id, hmm
                 # pie.operator("wm.tool_set_by_id", text=tool['label'], icon_value=tool['icon_value']).name = boxcutter
-                pie.operator("machin3.set_tool_by_name", text="   " + tool['label'], depress=tool['active'], icon_value=tool['icon_value']).name = boxcutter
+                pie.operator("machin3.set_tool_by_name", text="   " + tool['label'], depress=active_tool == boxcutter, icon_value=tool['icon_value']).name = boxcutter
             else:
                 pie.separator()
 
@@ -2761,7 +2818,7 @@ class PieTools(Menu):
             if 'Hops' in tools:
                 tool = tools['Hops']
                 # pie.operator("wm.tool_set_by_id", text=tool['label'], icon_value=tool['icon_value']).name = 'Hops'
-                pie.operator("machin3.set_tool_by_name", text="   " + tool['label'], depress=tool['active'], icon_value=tool['icon_value']).name = 'Hops'
+                pie.operator("machin3.set_tool_by_name", text="   " + tool['label'], depress=active_tool == 'Hops', icon_value=tool['icon_value']).name = 'Hops'
             else:
                 pie.separator()
 
@@ -2779,8 +2836,6 @@ class PieTools(Menu):
             # 8 - TOP
             if 'builtin.select_box' in tools:
                 if hypercursor:
-                    active_tool = get_active_tool(context).idname
-
                     # set the last used hyper cursor tool
                     if 'machin3.tool_hyper_cursor' in active_tool:
                         hypercursorlast = active_tool
@@ -2790,11 +2845,11 @@ class PieTools(Menu):
 
                     name = hc if active_tool == 'builtin.select_box' else 'builtin.select_box'
                     tool = tools[name]
-                    pie.operator("machin3.set_tool_by_name", text="   " + tool['label'], depress=tool['active'], icon_value=tool['icon_value']).name=name
+                    pie.operator("machin3.set_tool_by_name", text="   " + tool['label'], depress=active_tool == name, icon_value=tool['icon_value']).name=name
 
                 else:
                     tool = tools['builtin.select_box']
-                    pie.operator("machin3.set_tool_by_name", text="   " + tool['label'], depress=tool['active'], icon_value=tool['icon_value']).name='builtin.select_box'
+                    pie.operator("machin3.set_tool_by_name", text="   " + tool['label'], depress=active_tool == 'builtin.select_box', icon_value=tool['icon_value']).name='builtin.select_box'
 
             else:
                 pie.separator()
@@ -56,3 +56,75 @@ def update_asset_catalogs(self, context):
 
     default = get_prefs().preferred_default_catalog if get_prefs().preferred_default_catalog in self.catalogs else 'NONE'
     bpy.types.WindowManager.M3_asset_catalogs = bpy.props.EnumProperty(name="Asset Categories", items=items, default=default)
+
+
+# ASSET HELPER INDEX
+
+asset_helper_index = {}
+
+
+def get_asset_helper_objects(collection):
+    '''
+    return MESHmachine stash objects and DECALmachine decal backups belonging to the objects of an asset collection
+    these are pulled into the scene along with the collection, when an asset is inserted, but should never be linked
+    the helpers are cached per collection as (name, library path) keys along with their pointers, and the cache is validated by the number of objects in it
+    each resolved object has to match the stored pointer and still be a helper, so renamed, swapped or same-named linked objects are never returned
+    as pointers can be reused after undo or loading a file, the index is cleared then too, see clear_id_caches()
+    '''
+
+    key = collection.as_pointer()
+    signature = len(collection.all_objects)
+
+    entry = asset_helper_index.get(key)
+
+    if entry is None or entry['signature'] != signature:
+        helpers = set()
+
+        for obj in collection.all_objects:
+            mm = getattr(obj, 'MM', None)
+            dm = getattr(obj, 'DM', None)
+
+            if mm:
+                if mm.isstashobj:
+                    helpers.add(obj)
+
+                helpers.update(stash.obj for stash in mm.stashes if stash.obj)
+
+            if dm:
+                if dm.isbackup:
+                    helpers.add(obj)
+
+                if dm.isdecal and dm.decalbackup:
+                    helpers.add(dm.decalbackup)
+
+        entry = {'signature': signature, 'helpers': [((obj.name, obj.library.filepath if obj.library else None), obj.as_pointer()) for obj in helpers]}
+        asset_helper_index[key] = entry
+
+    objects = []
+
+    for objkey, pointer in entry['helpers']:
+        obj = bpy.data.objects.get(objkey)
+
+        if obj and obj.as_pointer() == pointer and is_asset_helper(obj):
+            objects.append(obj)
+
+    return objects
+
+
+def is_asset_helper(obj):
+    mm = getattr(obj, 'MM', None)
+    dm = getattr(obj, 'DM', None)
+
+    return bool((mm and mm.isstashobj) or (dm and dm.isbackup))
+
+
+def invalidate_asset_helper_index(collection=None):
+    '''
+    remove the cached helper objects of the passed in collection, or of all collections
+    '''
+
+    if collection is None:
+        asset_helper_index.clear()
+
+    else:
+        asset_helper_index.pop(collection.as_pointer(), None)
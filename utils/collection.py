@@ -37,6 +37,18 @@ def get_scene_collections(scene, ignore_decals=True):
     return scenecols
 
 
+def get_collection_key(context, col):
+    '''
+    return a key, that can be passed to bpy.data.collections.get() to resolve the collection again
+    the scene collection isn't part of bpy.data.collections, and is keyed as None
+    '''
+
+    if col == context.scene.collection:
+        return None
+
+    return (col.name, col.library.filepath if col.library else None)
+
+
 def get_collection_depth(self, collections, depth=0, init=False):
     if init or depth > self.depth:
         self.depth = depth
@@ -1,5 +1,6 @@
 import bpy
 from mathutils import Vector, Matrix
+import numpy as np
 import gpu
 from gpu_extras.batch import batch_for_shader
 from gpu_extras.presets import draw_circle_2d
@@ -10,60 +11,68 @@ from . ui import require_header_offset
 from .. colors import red, green, blue, black, white
 
 
-def draw_axes_HUD(context, objects):
-    if context.space_data.overlay.show_overlays:
-        m3 = context.scene.M3
+# batch and shader of the axes HUD, rebuilt only when the axes objects, their transforms, the size, alpha or frame change
+axes_HUD_cache = {}
 
-        size = m3.object_axes_size
-        alpha = m3.object_axes_alpha
 
-        axes = [(Vector((1, 0, 0)), red), (Vector((0, 1, 0)), green), (Vector((0, 0, 1)), blue)]
+def get_axes_HUD_batch(objects, size, alpha):
+    '''
+    put the axes of all objects into a single LINES batch, colored per vertex, so they are drawn in one call
+    '''
+
+    shader = axes_HUD_cache.get('shader')
 
-        for axis, color in axes:
-            coords = []
+    if shader is None:
+        shader = gpu.shader.from_builtin('3D_FLAT_COLOR')
+        axes_HUD_cache['shader'] = shader
 
-            # draw object(s)
-            for obj in objects:
-                mx = obj.matrix_world
-                origin = mx.decompose()[0]
+    mxs = np.array([obj.matrix_world for obj in objects], dtype=np.float32)
 
-                # coords.append(origin)
-                coords.append(origin + mx.to_3x3() @ axis * size * 0.1)
-                coords.append(origin + mx.to_3x3() @ axis * size)
+    origins = mxs[:, :3, 3]
 
-                """
-                # debuging stash + stashtargtmx for object origin changes
-                for stash in obj.MM.stashes:
-                    if s tash.obj:
-                        smx = sta sh.obj.MM.stashmx
-                        sorigin = smx.decompose()[0]
+    # the x, y and z axes are the columns of the 3x3 part, so transposing puts them in rows of shape (objects, 3 axes, 3)
+    axes = mxs[:, :3, :3].transpose(0, 2, 1)
 
-                        coords.append(sorigin + smx.to_3x3() @ axis * size * 0.1)
-                        coords.append(sorigin + smx.to_3x3() @ axis * size)
+    # start and end point of each axis line, interleaved, shape (objects, 3 axes, 2 points, 3)
+    coords = np.empty((len(objects), 3, 2, 3), dtype=np.float32)
+    coords[:, :, 0] = origins[:, None] + axes * size * 0.1
+    coords[:, :, 1] = origins[:, None] + axes * size
 
+    colors = np.empty((len(objects), 3, 2, 4), dtype=np.float32)
+    colors[:, :, :, :3] = np.array((red, green, blue), dtype=np.float32)[None, :, None]
+    colors[:, :, :, 3] = alpha
 
-                        stmx = stash.obj.MM.stashtargetmx
-                        storigin = stmx.decompose()[0]
+    return shader, batch_for_shader(shader, 'LINES', {"pos": coords.reshape(-1, 3), "color": colors.reshape(-1, 4)})
 
-                        coords.append(storigin + stmx.to_3x3() @ axis * size * 0.1)
-                        coords.append(storigin + stmx.to_3x3() @ axis * size)
-                """
 
-            if coords:
-                indices = [(i, i + 1) for i in range(0, len(coords), 2)]
+def invalidate_axes_HUD():
+    axes_HUD_cache.pop('batch', None)
 
-                shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
-                shader.bind()
-                shader.uniform_float("color", (*color, alpha))
 
-                gpu.state.depth_test_set('NONE')
-                gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
-                gpu.state.line_width_set(2)
+def draw_axes_HUD(context, objects):
+    if context.space_data.overlay.show_overlays and objects:
+        m3 = context.scene.M3
 
-                use_legacy_line_smoothing(alpha, 2)
+        size = m3.object_axes_size
+        alpha = m3.object_axes_alpha
 
-                batch = batch_for_shader(shader, 'LINES', {"pos": coords}, indices=indices)
-                batch.draw(shader)
+        # transforms of the objects are tracked via invalidate_axes_HUD(), called from the depsgraph handler, but animation playback doesn't cause depsgraph updates
+        key = (size, alpha, context.scene.frame_current)
+
+        if axes_HUD_cache.get('batch') is None or axes_HUD_cache.get('key') != key:
+            axes_HUD_cache['key'] = key
+            axes_HUD_cache['shader'], axes_HUD_cache['batch'] = get_axes_HUD_batch(objects, size, alpha)
+
+        gpu.state.depth_test_set('NONE')
+        gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
+        gpu.state.line_width_set(2)
+
+        use_legacy_line_smoothing(alpha, 2)
+
+        shader = axes_HUD_cache['shader']
+        shader.bind()
+
+        axes_HUD_cache['batch'].draw(shader)
 
 
 def draw_focus_HUD(context, color=(1, 1, 1), alpha=1, width=2):
@@ -136,6 +145,30 @@ def draw_surface_slide_HUD(context, color=(1, 1, 1), alpha=1, width=2):
         blf.draw(font, title)
 
 
+# text dimensions, keyed by font, text and size
+text_dimensions_cache = {}
+
+
+def get_text_dimensions(text, size, font=0):
+    '''
+    cached blf.dimensions(), note that it sets the font size, when the dimensions aren't cached yet
+    '''
+
+    key = (font, text, size)
+    dimensions = text_dimensions_cache.get(key)
+
+    if dimensions is None:
+
+        # keep it from growing indefinitely, as labels with props can be arbitrary
+        if len(text_dimensions_cache) > 1000:
+            text_dimensions_cache.clear()
+
+        blf.size(font, size, 72)
+        dimensions = text_dimensions_cache[key] = blf.dimensions(font, text)
+
+    return dimensions
+
+
 def draw_screen_cast_HUD(context):
     p = get_prefs()
     operators = get_last_operators(context, debug=False)[-p.screencast_operator_count:]
@@ -159,14 +192,16 @@ def draw_screen_cast_HUD(context):
 
     # get addon prefix offset, based on widest possiblestring 'MM', and based on empasized last op's size
     if p.screencast_show_addon:
-        blf.size(font, round(p.screencast_fontsize * scale * emphasize), 72)
-        addon_offset_x = blf.dimensions(font, 'MM')[0]
+        addon_offset_x = get_text_dimensions('MM', round(p.screencast_fontsize * scale * emphasize), font=font)[0]
     else:
         addon_offset_x = 0
 
     y = 0
     hgap = 10
 
+    # the font size, the vertical offset of each op is measured with, which is the one of the previous op
+    prev_size = None
+
     for idx, (addon, label, idname, prop) in enumerate(reversed(operators)):
         size = round(p.screencast_fontsize * scale * (emphasize if idx == 0 else 1))
         vgap = round(size / 2)
@@ -187,7 +222,7 @@ def draw_screen_cast_HUD(context):
         text = f"{label}: {prop}" if prop else label
 
         x = offset_x + addon_offset_x
-        y = offset_y * scale if idx == 0 else y + (blf.dimensions(font, text)[1] + vgap)
+        y = offset_y * scale if idx == 0 else y + (get_text_dimensions(text, prev_size, font=font)[1] + vgap)
 
         blf.size(font, size, 72)
         blf.color(font, *color, alpha)
@@ -199,7 +234,7 @@ def draw_screen_cast_HUD(context):
         # idname
 
         if p.screencast_show_idname:
-            x += blf.dimensions(font, text)[0] + hgap
+            x += get_text_dimensions(text, size, font=font)[0] + hgap
 
             blf.size(font, size - 2, 72)
             blf.color(font, *color, alpha * 0.3)
@@ -221,7 +256,7 @@ def draw_screen_cast_HUD(context):
         if addon and p.screencast_show_addon:
             blf.size(font, size, 72)
 
-            x = offset_x + addon_offset_x - blf.dimensions(font, addon)[0] - (hgap / 2)
+            x = offset_x + addon_offset_x - get_text_dimensions(addon, size, font=font)[0] - (hgap / 2)
 
             blf.color(font, *white, alpha * 0.3)
             blf.position(font, x, y, 0)
@@ -229,7 +264,9 @@ def draw_screen_cast_HUD(context):
             blf.draw(font, addon)
 
         if idx == 0:
-            y += blf.dimensions(font, text)[1]
+            y += get_text_dimensions(text, size, font=font)[1]
+
+        prev_size = size
 
 
 # HUD
@@ -295,16 +332,7 @@ def use_legacy_line_smoothing(alpha, width):
 
 def draw_point(co, mx=Matrix(), color=(1, 1, 1), size=6, alpha=1, xray=True, modal=True):
     def draw():
-        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
-        shader.bind()
-        shader.uniform_float("color", (*color, alpha))
-
-        gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
-        gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
-        gpu.state.point_size_set(size)
-
-        batch = batch_for_shader(shader, 'POINTS', {"pos": [mx @ co]})
-        batch.draw(shader)
+        DrawBatch('POINTS', [co], mx=mx, color=color, size=size, alpha=alpha, xray=xray).draw()
 
     if modal:
         draw()
@@ -315,28 +343,7 @@ def draw_point(co, mx=Matrix(), color=(1, 1, 1), size=6, alpha=1, xray=True, mod
 
 def draw_points(coords, indices=None, mx=Matrix(), color=(1, 1, 1), size=6, alpha=1, xray=True, modal=True):
     def draw():
-        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
-        shader.bind()
-        shader.uniform_float("color", (*color, alpha))
-
-        gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
-        gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
-        gpu.state.point_size_set(size)
-
-        if indices:
-            if mx != Matrix():
-                batch = batch_for_shader(shader, 'POINTS', {"pos": [mx @ co for co in coords]}, indices=indices)
-            else:
-                batch = batch_for_shader(shader, 'POINTS', {"pos": coords}, indices=indices)
-
-        else:
-            if mx != Matrix():
-                batch = batch_for_shader(shader, 'POINTS', {"pos": [mx @ co for co in coords]})
-            else:
-                batch = batch_for_shader(shader, 'POINTS', {"pos": coords})
-
-        batch.draw(shader)
-
+        DrawBatch('POINTS', coords, indices=indices, mx=mx, color=color, size=size, alpha=alpha, xray=xray).draw()
 
     if modal:
         draw()
@@ -356,18 +363,7 @@ def draw_line(coords, indices=None, mx=Matrix(), color=(1, 1, 1), width=1, alpha
         if not indices:
             indices = [(i, i + 1) for i in range(0, len(coords)) if i < len(coords) - 1]
 
-        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
-        shader.bind()
-        shader.uniform_float("color", (*color, alpha))
-
-        gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
-        gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
-        gpu.state.line_width_set(width)
-
-        use_legacy_line_smoothing(alpha, width)
-
-        batch = batch_for_shader(shader, 'LINES', {"pos": [mx @ co for co in coords]}, indices=indices)
-        batch.draw(shader)
+        DrawBatch('LINES', coords, indices=indices, mx=mx, color=color, width=width, alpha=alpha, xray=xray).draw()
 
     if modal:
         draw()
@@ -381,28 +377,7 @@ def draw_lines(coords, indices=None, mx=Matrix(), color=(1, 1, 1), width=1, alph
     takes an even amount of coordinates and draws half as many 2-point lines
     """
     def draw():
-        nonlocal indices
-
-        if not indices:
-            indices = [(i, i + 1) for i in range(0, len(coords), 2)]
-
-        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
-        shader.bind()
-        shader.uniform_float("color", (*color, alpha))
-
-        gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
-        gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
-        gpu.state.line_width_set(width)
-
-        use_legacy_line_smoothing(alpha, width)
-
-        if mx != Matrix():
-            batch = batch_for_shader(shader, 'LINES', {"pos": [mx @ co for co in coords]}, indices=indices)
-
-        else:
-            batch = batch_for_shader(shader, 'LINES', {"pos": coords}, indices=indices)
-
-        batch.draw(shader)
+        DrawBatch('LINES', coords, indices=indices, mx=mx, color=color, width=width, alpha=alpha, xray=xray).draw()
 
     if modal:
         draw()
@@ -413,21 +388,7 @@ def draw_lines(coords, indices=None, mx=Matrix(), color=(1, 1, 1), width=1, alph
 
 def draw_vector(vector, origin=Vector((0, 0, 0)), mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True):
     def draw():
-        coords = [mx @ origin, mx @ origin + mx.to_3x3() @ vector]
-
-        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
-        shader.bind()
-        shader.uniform_float("color", (*color, alpha))
-
-        gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
-        gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
-        gpu.state.line_width_set(width)
-
-        use_legacy_line_smoothing(alpha, width)
-
-        batch = batch_for_shader(shader, 'LINES', {"pos": coords})
-        batch.draw(shader)
-
+        DrawBatch('LINES', [origin, origin + vector], mx=mx, color=color, width=width, alpha=alpha, xray=xray).draw()
 
     if modal:
         draw()
@@ -438,27 +399,7 @@ def draw_vector(vector, origin=Vector((0, 0, 0)), mx=Matrix(), color=(1, 1, 1),
 
 def draw_vectors(vectors, origins, mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True):
     def draw():
-        coords = []
-
-        for v, o in zip(vectors, origins):
-            coords.append(mx @ o)
-            coords.append(mx @ o + mx.to_3x3() @ v)
-
-        indices = [(i, i + 1) for i in range(0, len(coords), 2)]
-
-        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
-        shader.bind()
-        shader.uniform_float("color", (*color, alpha))
-
-        gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
-        gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
-        gpu.state.line_width_set(width)
-
-        use_legacy_line_smoothing(alpha, width)
-
-        batch = batch_for_shader(shader, 'LINES', {"pos": coords}, indices=indices)
-        batch.draw(shader)
-
+        DrawBatch('LINES', [co for v, o in zip(vectors, origins) for co in (o, o + v)], mx=mx, color=color, width=width, alpha=alpha, xray=xray).draw()
 
     if modal:
         draw()
@@ -517,55 +458,29 @@ def draw_mesh_wire(batch, color=(1, 1, 1), width=1, alpha=1, xray=True, modal=Tr
 
 def draw_bbox(bbox, mx=Matrix(), color=(1, 1, 1), corners=0, width=1, alpha=1, xray=True, modal=True):
     """
-    takes an even amount of coordinates and draws half as many 2-point lines
+    takes the 8 bbox coordinates and draws its edges, or just its corners
     """
 
     def draw():
-        if corners:
-            length = corners
-
-            coords = [bbox[0], bbox[0] + (bbox[1] - bbox[0]) * length, bbox[0] + (bbox[3] - bbox[0]) * length, bbox[0] + (bbox[4] - bbox[0]) * length,
-                      bbox[1], bbox[1] + (bbox[0] - bbox[1]) * length, bbox[1] + (bbox[2] - bbox[1]) * length, bbox[1] + (bbox[5] - bbox[1]) * length,
-                      bbox[2], bbox[2] + (bbox[1] - bbox[2]) * length, bbox[2] + (bbox[3] - bbox[2]) * length, bbox[2] + (bbox[6] - bbox[2]) * length,
-                      bbox[3], bbox[3] + (bbox[0] - bbox[3]) * length, bbox[3] + (bbox[2] - bbox[3]) * length, bbox[3] + (bbox[7] - bbox[3]) * length,
-                      bbox[4], bbox[4] + (bbox[0] - bbox[4]) * length, bbox[4] + (bbox[5] - bbox[4]) * length, bbox[4] + (bbox[7] - bbox[4]) * length,
-                      bbox[5], bbox[5] + (bbox[1] - bbox[5]) * length, bbox[5] + (bbox[4] - bbox[5]) * length, bbox[5] + (bbox[6] - bbox[5]) * length,
-                      bbox[6], bbox[6] + (bbox[2] - bbox[6]) * length, bbox[6] + (bbox[5] - bbox[6]) * length, bbox[6] + (bbox[7] - bbox[6]) * length,
-                      bbox[7], bbox[7] + (bbox[3] - bbox[7]) * length, bbox[7] + (bbox[4] - bbox[7]) * length, bbox[7] + (bbox[6] - bbox[7]) * length]
-
-            indices = [(0, 1), (0, 2), (0, 3),
-                       (4, 5), (4, 6), (4, 7),
-                       (8, 9), (8, 10), (8, 11),
-                       (12, 13), (12, 14), (12, 15),
-                       (16, 17), (16, 18), (16, 19),
-                       (20, 21), (20, 22), (20, 23),
-                       (24, 25), (24, 26), (24, 27),
-                       (28, 29), (28, 30), (28, 31)]
-
-
-        else:
-            coords = bbox
-            indices = [(0, 1), (1, 2), (2, 3), (3, 0),
-                       (4, 5), (5, 6), (6, 7), (7, 4),
-                       (0, 4), (1, 5), (2, 6), (3, 7)]
+        coords, indices = get_bbox_lines(bbox, corners=corners)
 
-        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
-        shader.bind()
-        shader.uniform_float("color", (*color, alpha))
+        DrawBatch('LINES', coords, indices=indices, mx=mx, color=color, width=width, alpha=alpha, xray=xray).draw()
 
-        gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
-        gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
-        gpu.state.line_width_set(width)
+    if modal:
+        draw()
 
-        use_legacy_line_smoothing(alpha, width)
+    else:
+        bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
 
-        if mx != Matrix():
-            batch = batch_for_shader(shader, 'LINES', {"pos": [mx @ co for co in coords]}, indices=indices)
 
-        else:
-            batch = batch_for_shader(shader, 'LINES', {"pos": coords}, indices=indices)
+def draw_cross_3d(co, mx=Matrix(), color=(1, 1, 1), width=1, length=1, alpha=1, xray=True, modal=True):
+    """
+    draws a 3 axis cross at co
+    """
+    def draw():
+        coords, indices = get_cross_3d_lines(co, length=length)
 
-        batch.draw(shader)
+        DrawBatch('LINES', coords, indices=indices, mx=mx, color=color, width=width, alpha=alpha, xray=xray).draw()
 
     if modal:
         draw()
@@ -574,68 +489,147 @@ def draw_bbox(bbox, mx=Matrix(), color=(1, 1, 1), corners=0, width=1, alpha=1, x
         bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
 
 
-def draw_cross_3d(co, mx=Matrix(), color=(1, 1, 1), width=1, length=1, alpha=1, xray=True, modal=True):
-    """
-    takes an even amount of coordinates and draws half as many 2-point lines
-    """
+def draw_tris(coords, indices=None, mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True):
     def draw():
+        DrawBatch('TRIS', coords, indices=indices, mx=mx, color=color, width=width, alpha=alpha, xray=xray).draw()
 
-        x = Vector((1, 0, 0))
-        y = Vector((0, 1, 0))
-        z = Vector((0, 0, 1))
+    if modal:
+        draw()
 
-        coords = [(co - x) * length, (co + x) * length,
-                  (co - y) * length, (co + y) * length,
-                  (co - z) * length, (co + z) * length]
+    else:
+        bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
 
-        indices = [(0, 1), (2, 3), (4, 5)]
 
-        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
-        shader.bind()
-        shader.uniform_float("color", (*color, alpha))
+# SHAPES
 
-        gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
-        gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
-        gpu.state.line_width_set(width)
+def get_bbox_lines(bbox, corners=0):
+    '''
+    return coords and line indices of a bbox's edges, or of its corners only, with corners being the length of each corner line as a factor of the edge length
+    '''
 
-        use_legacy_line_smoothing(alpha, width)
+    if corners:
+        length = corners
+
+        coords = [bbox[0], bbox[0] + (bbox[1] - bbox[0]) * length, bbox[0] + (bbox[3] - bbox[0]) * length, bbox[0] + (bbox[4] - bbox[0]) * length,
+                  bbox[1], bbox[1] + (bbox[0] - bbox[1]) * length, bbox[1] + (bbox[2] - bbox[1]) * length, bbox[1] + (bbox[5] - bbox[1]) * length,
+                  bbox[2], bbox[2] + (bbox[1] - bbox[2]) * length, bbox[2] + (bbox[3] - bbox[2]) * length, bbox[2] + (bbox[6] - bbox[2]) * length,
+                  bbox[3], bbox[3] + (bbox[0] - bbox[3]) * length, bbox[3] + (bbox[2] - bbox[3]) * length, bbox[3] + (bbox[7] - bbox[3]) * length,
+                  bbox[4], bbox[4] + (bbox[0] - bbox[4]) * length, bbox[4] + (bbox[5] - bbox[4]) * length, bbox[4] + (bbox[7] - bbox[4]) * length,
+                  bbox[5], bbox[5] + (bbox[1] - bbox[5]) * length, bbox[5] + (bbox[4] - bbox[5]) * length, bbox[5] + (bbox[6] - bbox[5]) * length,
+                  bbox[6], bbox[6] + (bbox[2] - bbox[6]) * length, bbox[6] + (bbox[5] - bbox[6]) * length, bbox[6] + (bbox[7] - bbox[6]) * length,
+                  bbox[7], bbox[7] + (bbox[3] - bbox[7]) * length, bbox[7] + (bbox[4] - bbox[7]) * length, bbox[7] + (bbox[6] - bbox[7]) * length]
+
+        indices = [(0, 1), (0, 2), (0, 3),
+                   (4, 5), (4, 6), (4, 7),
+                   (8, 9), (8, 10), (8, 11),
+                   (12, 13), (12, 14), (12, 15),
+                   (16, 17), (16, 18), (16, 19),
+                   (20, 21), (20, 22), (20, 23),
+                   (24, 25), (24, 26), (24, 27),
+                   (28, 29), (28, 30), (28, 31)]
 
-        if mx != Matrix():
-            batch = batch_for_shader(shader, 'LINES', {"pos": [mx @ co for co in coords]}, indices=indices)
+    else:
+        coords = bbox
+        indices = [(0, 1), (1, 2), (2, 3), (3, 0),
+                   (4, 5), (5, 6), (6, 7), (7, 4),
+                   (0, 4), (1, 5), (2, 6), (3, 7)]
 
-        else:
-            batch = batch_for_shader(shader, 'LINES', {"pos": coords}, indices=indices)
+    return coords, indices
 
-        batch.draw(shader)
 
-    if modal:
-        draw()
+def get_cross_3d_lines(co, length=1):
+    x = Vector((1, 0, 0))
+    y = Vector((0, 1, 0))
+    z = Vector((0, 0, 1))
 
-    else:
-        bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
+    coords = [(co - x) * length, (co + x) * length,
+              (co - y) * length, (co + y) * length,
+              (co - z) * length, (co + z) * length]
 
+    indices = [(0, 1), (2, 3), (4, 5)]
 
+    return coords, indices
 
-def draw_tris(coords, indices=None, mx=Matrix(), color=(1, 1, 1), width=1, alpha=1, xray=True, modal=True):
-    def draw():
-        shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
-        shader.bind()
-        shader.uniform_float("color", (*color, alpha))
 
-        gpu.state.depth_test_set('NONE' if xray else 'LESS_EQUAL')
-        gpu.state.blend_set('ALPHA' if alpha < 1 else 'NONE')
-        gpu.state.line_width_set(width)
+# RETAINED
 
-        if mx != Matrix():
-            batch = batch_for_shader(shader, 'TRIS', {"pos": [mx @ co for co in coords]}, indices=indices)
+class DrawBatch:
+    '''
+    retained mode drawing of points, lines or tris in the 3D view
+    declare it once, e.g. in an operator's invoke(), keep the instance around as a handle, and call draw() from the POST_VIEW draw handler
+    update() only rebuilds the GPU buffers, if coords or indices are passed in, matrix, color, alpha, width, size and xray changes are free
+    the matrix is put on the GPU matrix stack, instead of transforming every coordinate in python
+    '''
 
-        else:
-            batch = batch_for_shader(shader, 'TRIS', {"pos": coords}, indices=indices)
+    def __init__(self, type='LINES', coords=None, indices=None, mx=None, color=(1, 1, 1), alpha=1, width=1, size=6, xray=True):
+        self.type = type
 
-        batch.draw(shader)
+        self.coords = []
+        self.indices = None
+        self.batch = None
 
-    if modal:
-        draw()
+        self.mx = None
+        self.color = color
+        self.alpha = alpha
+        self.width = width
+        self.size = size
+        self.xray = xray
 
-    else:
-        bpy.types.SpaceView3D.draw_handler_add(draw, (), 'WINDOW', 'POST_VIEW')
+        self.shader = gpu.shader.from_builtin('3D_UNIFORM_COLOR')
+
+        self.update(coords=coords, indices=indices, mx=mx)
+
+    def update(self, coords=None, indices=None, mx=None, color=None, alpha=None, width=None, size=None, xray=None):
+        if coords is not None or indices is not None:
+            if coords is not None:
+                self.coords = coords
+
+            # passing in coords without indices clears the previous indices
+            self.indices = indices
+
+            self.batch = batch_for_shader(self.shader, self.type, {"pos": self.coords}, indices=self.indices) if len(self.coords) else None
+
+        if mx is not None:
+
+            # skip pushing identity matrices onto the stack
+            self.mx = None if mx == Matrix() else mx
+
+        if color is not None:
+            self.color = color
+
+        if alpha is not None:
+            self.alpha = alpha
+
+        if width is not None:
+            self.width = width
+
+        if size is not None:
+            self.size = size
+
+        if xray is not None:
+            self.xray = xray
+
+    def draw(self):
+        if self.batch:
+            self.shader.bind()
+            self.shader.uniform_float("color", (*self.color, self.alpha))
+
+            gpu.state.depth_test_set('NONE' if self.xray else 'LESS_EQUAL')
+            gpu.state.blend_set('ALPHA' if self.alpha < 1 else 'NONE')
+
+            if self.type == 'POINTS':
+                gpu.state.point_size_set(self.size)
+
+            else:
+                gpu.state.line_width_set(self.width)
+
+                if self.type != 'TRIS':
+                    use_legacy_line_smoothing(self.alpha, self.width)
+
+            if self.mx:
+                with gpu.matrix.push_pop():
+                    gpu.matrix.multiply_matrix(self.mx)
+                    self.batch.draw(self.shader)
+
+            else:
+                self.batch.draw(self.shader)
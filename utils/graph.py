@@ -1,18 +1,9 @@
-import sys
+from heapq import heappush, heappop
+from itertools import count
+import numpy as np
 
 
-def build_mesh_graph(verts, edges, topo=True):
-    mg = {}
-    for v in verts:
-        mg[v] = []
-
-    for e in edges:
-        distance = 1 if topo else e.calc_length()
-
-        mg[e.verts[0]].append((e.verts[1], distance))
-        mg[e.verts[1]].append((e.verts[0], distance))
-
-    return mg
+adjacency_cache = {}
 
 
 def get_shortest_path(bm, vstart, vend, topo=False, select=False):
@@ -20,48 +11,56 @@ def get_shortest_path(bm, vstart, vend, topo=False, select=False):
     author: "G Bantle, Bagration, MACHIN3",
     source: "https://blenderartists.org/forum/showthread.php?58564-Path-Select-script(Update-20060307-Ported-to-C-now-in-CVS",
     video: https://www.youtube.com/watch?v=_lHSawdgXpI
+
+    A* search on a binary heap, expanding the bmesh lazily via link_edges, instead of building a graph of the entire mesh up front
+    in TOPO mode every edge costs 1 and the heuristic is 0, so it's a plain breadth first search
+    in LENGTH mode the euclidean distance to vend is used as the heuristic, which never overestimates, so the path is still the shortest
+    in both modes the search exits as soon as vend is popped from the heap
     """
 
-    def dijkstra(mg, vstart, vend, topo=True):
-        # initiate dict to collect distances from stat vert to every other vert
-        d = dict.fromkeys(mg.keys(), sys.maxsize)
+    def astar(vstart, vend, topo=True):
+        endco = vend.co
+
+        # accumulated distances from vstart, only for verts seen so far
+        d = {vstart: 0}
 
         # predecessor dict to track the path walked
-        predecessor = dict.fromkeys(mg.keys())
+        predecessor = {vstart: None}
 
-        # the distance of the start vert to itself is 0
-        d[vstart] = 0
+        # verts whose shortest distance is final
+        closed = set()
 
-        # keep track of what verts are seen and add the the accumulated distances to those verts
-        unknownverts = [(0, vstart)]
+        # BMVerts can't be compared, so a running counter breaks ties in the heap
+        tiebreak = count()
 
-        # with topo you can exit as soon as you hit the vend, without topo you can't, because the shorter distance my involve more vert hops
-        # while (topo and vstart != vend) or (not topo and unknownverts):
-        while unknownverts:
-            # sorting actually doesn't seem to  be required, but it was in the original source
-            # I question why the list needs to be sorted by index at all. also, doing it via the lambda function is very slow for some reason
-            # unknownverts.sort(key=lambda x: x[1].index)
+        heap = [(0, next(tiebreak), vstart)]
 
-            # get the next vert that is closest to vstart
-            dist, vcurrent = unknownverts[0]
+        while heap:
+            _, _, vcurrent = heappop(heap)
 
-            # use the mesh graph to retrieve the other verts connected
-            others = mg[vcurrent]
+            # the same vert can be pushed multiple times, only the first pop counts
+            if vcurrent in closed:
+                continue
 
-            # choose the next vert with the shortest accumulated distance
-            for vother, distance in others:
-                if d[vother] > d[vcurrent] + distance:
-                    d[vother] = d[vcurrent] + distance
+            if vcurrent == vend:
+                break
 
-                    unknownverts.append((d[vother], vother))
-                    predecessor[vother] = vcurrent
+            closed.add(vcurrent)
+            dcurrent = d[vcurrent]
 
-            # we've finished exploring this vert, pop it
-            unknownverts.pop(0)
+            for e in vcurrent.link_edges:
+                vother = e.other_vert(vcurrent)
 
-            # you can break out early when determening the topological distances
-            if topo and vcurrent == vend:
-                break
+                if vother in closed:
+                    continue
+
+                dother = dcurrent + (1 if topo else e.calc_length())
+
+                if dother < d.get(vother, dother + 1):
+                    d[vother] = dother
+                    predecessor[vother] = vcurrent
+
+                    heappush(heap, (dother if topo else dother + (endco - vother.co).length, next(tiebreak), vother))
 
         # backtrace from the end vertex using the predecessor dict
         path = []
@@ -69,25 +68,13 @@ def get_shortest_path(bm, vstart, vend, topo=False, select=False):
 
         while endvert is not None:
             path.append(endvert)
-            endvert = predecessor[endvert]
+            endvert = predecessor.get(endvert)
 
-        return reversed(path)
-
-    def f7(seq):
-        seen = set()
-        seen_add = seen.add
-        return [x for x in seq if not (x in seen or seen_add(x))]
-
-    verts = [v for v in bm.verts]
-    edges = [e for e in bm.edges]
-
-    mg = build_mesh_graph(verts, edges, topo)
+        path.reverse()
+        return path
 
     # vert list, shortest dist from vstart to vend
-    path = dijkstra(mg, vstart, vend, topo)
-
-    # remove duplicates, keeps order, see https://stackoverflow.com/a/480227
-    path = f7(path)
+    path = astar(vstart, vend, topo)
 
     # optionally select the path
     if select:
@@ -95,3 +82,152 @@ def get_shortest_path(bm, vstart, vend, topo=False, select=False):
             v.select = True
 
     return path
+
+
+# ADJACENCY
+
+def get_csr(keys, values, count):
+    '''
+    group values by keys in compressed sparse row form
+    return offsets array of length count + 1 and the values sorted by key, so the values of key i are values[offsets[i]:offsets[i + 1]]
+    '''
+
+    order = np.argsort(keys, kind='stable')
+
+    offsets = np.zeros(count + 1, dtype=np.int64)
+    np.cumsum(np.bincount(keys, minlength=count), out=offsets[1:])
+
+    return offsets, values[order]
+
+
+class MeshAdjacency:
+    '''
+    vert, edge and face adjacency of a mesh as numpy index arrays, most of it in compressed sparse row form
+    all of it is pulled from the mesh via foreach_get, so building it doesn't touch individual elements in python
+    '''
+
+    def __init__(self, mesh):
+        self.vert_count = len(mesh.vertices)
+        self.edge_count = len(mesh.edges)
+        self.face_count = len(mesh.polygons)
+        self.loop_count = len(mesh.loops)
+
+        self.edge_verts = np.empty(self.edge_count * 2, dtype=np.int64)
+        mesh.edges.foreach_get('vertices', self.edge_verts)
+        self.edge_verts.shape = (self.edge_count, 2)
+
+        self.loop_verts = np.empty(self.loop_count, dtype=np.int64)
+        mesh.loops.foreach_get('vertex_index', self.loop_verts)
+
+        self.loop_edges = np.empty(self.loop_count, dtype=np.int64)
+        mesh.loops.foreach_get('edge_index', self.loop_edges)
+
+        loop_starts = np.empty(self.face_count, dtype=np.int64)
+        mesh.polygons.foreach_get('loop_start', loop_starts)
+
+        self.face_sizes = np.empty(self.face_count, dtype=np.int64)
+        mesh.polygons.foreach_get('loop_total', self.face_sizes)
+
+        # loops are stored face by face, so the face of each loop is just a repetition
+        self.loop_faces = np.repeat(np.arange(self.face_count), self.face_sizes)
+
+        self.face_offsets = np.append(loop_starts, self.loop_count)
+
+        edge_indices = np.repeat(np.arange(self.edge_count), 2)
+
+        self.vert_edges = get_csr(self.edge_verts.ravel(), edge_indices, self.vert_count)
+        self.vert_verts = get_csr(self.edge_verts.ravel(), self.edge_verts[:, ::-1].ravel(), self.vert_count)
+        self.edge_faces = get_csr(self.loop_edges, self.loop_faces, self.edge_count)
+
+    @property
+    def signature(self):
+        return self.vert_count, self.edge_count, self.face_count
+
+    @property
+    def vert_degrees(self):
+        return np.diff(self.vert_edges[0])
+
+    @property
+    def edge_face_counts(self):
+        return np.diff(self.edge_faces[0])
+
+    def get_manifold_edges(self):
+        '''
+        return bool mask of manifold edges, which like BMEdge.is_manifold, are edges with exactly 2 faces
+        '''
+
+        return self.edge_face_counts == 2
+
+    def get_non_manifold_verts(self):
+        '''
+        return bool mask of verts, that have at least one non-manifold edge
+        '''
+
+        mask = np.zeros(self.vert_count, dtype=bool)
+        mask[self.edge_verts[~self.get_manifold_edges()].ravel()] = True
+
+        return mask
+
+    def get_loose_verts(self):
+        return self.vert_degrees == 0
+
+    def get_loose_edges(self):
+        return self.edge_face_counts == 0
+
+    def get_loose_faces(self):
+        '''
+        return bool mask of faces, whose edges are all non-manifold
+        '''
+
+        if not self.face_count:
+            return np.zeros(0, dtype=bool)
+
+        manifold_loops = self.get_manifold_edges()[self.loop_edges]
+        return np.add.reduceat(manifold_loops.astype(np.int64), self.face_offsets[:-1]) == 0
+
+
+def get_mesh_adjacency(mesh):
+    '''
+    return the MeshAdjacency of the mesh, cached by mesh pointer
+    the cache is dropped by the depsgraph handler as soon as the mesh's geometry is updated, the element counts are only a cheap sanity check
+    changing the topology via bmesh is only seen by the handler once the operator has finished, so invalidate_mesh_adjacency() has to be called explicitly after such changes
+    in edit mode, the mesh has to be synced with the edit bmesh first, see sync_edit_mesh()
+    '''
+
+    key = mesh.as_pointer()
+    adjacency = adjacency_cache.get(key)
+
+    if adjacency is None or adjacency.signature != (len(mesh.vertices), len(mesh.edges), len(mesh.polygons)):
+        adjacency = MeshAdjacency(mesh)
+        adjacency_cache[key] = adjacency
+
+    return adjacency
+
+
+def sync_edit_mesh(obj, bm):
+    '''
+    write the edit bmesh into the mesh, so it can be read via foreach_get
+    the mesh elements are written in bmesh order, so updating the bmesh indices makes them line up with the mesh's
+    '''
+
+    obj.update_from_editmode()
+
+    bm.verts.index_update()
+    bm.edges.index_update()
+    bm.faces.index_update()
+
+    bm.verts.ensure_lookup_table()
+    bm.edges.ensure_lookup_table()
+    bm.faces.ensure_lookup_table()
+
+
+def invalidate_mesh_adjacency(mesh=None):
+    '''
+    remove the cached adjacency of the passed in mesh, or of all meshes
+    '''
+
+    if mesh is None:
+        adjacency_cache.clear()
+
+    else:
+        adjacency_cache.pop(mesh.as_pointer(), None)
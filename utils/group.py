@@ -5,6 +5,20 @@ from . math import average_locations, get_loc_matrix, get_rot_matrix
 from . import registration as r
 
 
+# group empties keyed by pointer, mapped to [group empty, the selection state last applied to it by the group handler], None meaning not applied yet
+# the objects are kept, so they don't have to be looked up by name again, the registry is cleared on load and undo, when the pointers change
+group_registry = {}
+
+# the pointers of the group empties, whose applied state is not False, so only those and the selected groups need to be checked for changes
+group_registry_pending = set()
+
+# the number of objects in the file, when the registry was last built, a change indicates added or removed objects
+group_registry_signature = None
+
+# whether groups have been registered or reset since the group handler last checked them
+group_registry_dirty = False
+
+
 # CREATION / DESTRUCTION
 
 def group(context, sel, location='AVERAGE', rotation='WORLD'):
@@ -29,6 +43,8 @@ def group(context, sel, location='AVERAGE', rotation='WORLD'):
         parent(obj, empty)
         obj.M3.is_group_object = True
 
+    register_group(empty)
+
     return empty
 
 
@@ -37,6 +53,8 @@ def ungroup(empty):
         unparent(obj)
         obj.M3.is_group_object = False
 
+    unregister_group(empty)
+
     bpy.data.objects.remove(empty, do_unlink=True)
 
 
@@ -66,6 +84,147 @@ def clean_up_groups(context):
             print(f"INFO: {obj.name} is now a group object, because it was manually parented to {obj.parent.name}")
 
 
+# REGISTRY
+
+def build_group_registry():
+    '''
+    collect all group empties in the file, which is the only time all objects are looked at
+    '''
+
+    global group_registry_signature, group_registry_dirty
+
+    group_registry.clear()
+    group_registry.update({obj.as_pointer(): [obj, None] for obj in bpy.data.objects if obj.M3.is_group_empty})
+
+    group_registry_pending.clear()
+    group_registry_pending.update(group_registry)
+
+    group_registry_signature = len(bpy.data.objects)
+    group_registry_dirty = True
+
+
+def get_group_registry():
+    '''
+    return the group registry, rebuilt if objects have been added or removed since, e.g. by duplication, deletion or appending
+    '''
+
+    if group_registry_signature != len(bpy.data.objects):
+        build_group_registry()
+
+    return group_registry
+
+
+def register_group(empty):
+    global group_registry_signature, group_registry_dirty
+
+    key = empty.as_pointer()
+
+    group_registry[key] = [empty, None]
+    group_registry_pending.add(key)
+    group_registry_dirty = True
+
+    # groups register themselves as they are created, so the added object doesn't require a rebuild, unless one was due already
+    if group_registry_signature is not None and group_registry_signature + 1 == len(bpy.data.objects):
+        group_registry_signature += 1
+
+
+def unregister_group(empty):
+    key = empty.as_pointer()
+
+    group_registry.pop(key, None)
+    group_registry_pending.discard(key)
+
+
+def reset_group_registry(clear=False):
+    '''
+    forget the selection states applied to the group empties, so the group handler updates all of them again
+    or clear the registry entirely, so it's rebuilt on next access, which is required on load and undo, as the kept objects are invalid then
+    '''
+
+    global group_registry_signature, group_registry_dirty
+
+    if clear:
+        group_registry.clear()
+        group_registry_pending.clear()
+        group_registry_signature = None
+
+    else:
+        for entry in group_registry.values():
+            entry[1] = None
+
+        group_registry_pending.update(group_registry)
+        group_registry_dirty = True
+
+
+def get_changed_groups(view_layer, depsgraph=None):
+    '''
+    return visible group empties, whose selection state differs from the one last applied, and their new selection state, and update the registry accordingly
+    only groups, whose state is pending or True, and the selected groups are checked, as any other group is known to be unselected
+    if the depsgraph is passed in, they are only checked if groups have been registered or reset since, or if the updates can have changed selection or visibility
+    which shows up as a scene update, or if they include a group empty
+    '''
+
+    global group_registry_dirty
+
+    registry = get_group_registry()
+
+    if depsgraph and not group_registry_dirty:
+        for update in depsgraph.updates:
+            if isinstance(update.id, bpy.types.Scene) or (isinstance(update.id, bpy.types.Object) and update.id.original.as_pointer() in registry):
+                break
+
+        else:
+            return []
+
+    group_registry_dirty = False
+
+    selected = {obj.as_pointer(): obj for obj in view_layer.objects.selected if obj.M3.is_group_empty}
+
+    changed = []
+
+    for key in group_registry_pending | selected.keys():
+
+        # group empties can be selected, before the registry knows about them, e.g. after being groupified
+        entry = registry.setdefault(key, [selected[key], None]) if key in selected else registry.get(key)
+
+        if entry is None:
+            group_registry_pending.discard(key)
+            continue
+
+        obj, state = entry
+
+        # the group empty may have been removed, or may not be a group empty anymore
+        try:
+            is_group_empty = obj.M3.is_group_empty
+
+        except ReferenceError:
+            is_group_empty = False
+
+        if not is_group_empty:
+            del registry[key]
+            group_registry_pending.discard(key)
+            continue
+
+        if obj.visible_get(view_layer=view_layer):
+            is_selected = key in selected
+
+            if is_selected != state:
+                entry[1] = is_selected
+                changed.append((obj, is_selected))
+
+            if is_selected:
+                group_registry_pending.add(key)
+
+            else:
+                group_registry_pending.discard(key)
+
+        # hidden groups stay pending, until they are visible again
+        else:
+            group_registry_pending.add(key)
+
+    return changed
+
+
 # CONTEXT
 
 def get_group_polls(context):
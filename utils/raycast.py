@@ -2,12 +2,354 @@ import bpy
 from bpy_extras.view3d_utils import region_2d_to_origin_3d, region_2d_to_vector_3d
 import bmesh
 from mathutils.bvhtree import BVHTree as BVH
+from collections import OrderedDict
+import numpy as np
 import sys
+from . registration import get_prefs
+
+
+bvh_cache = OrderedDict()
+scene_candidates = {}
+aabb_cache = {}
+
+
+# BVH CACHE
+
+def get_bvh(obj):
+    '''
+    return BVH of the object's mesh, fetched from the cache if possible, or created and cached otherwise
+    entries are keyed by object name and mesh pointer, and are only reused if the mesh's geometry hasn't changed, see get_mesh_signature()
+    the bmesh is only used to create the BVH, which copies the geometry, so it's freed right away, and evicting entries never invalidates anything handed out before
+    '''
+
+    mesh = obj.data
+
+    key = (obj.name, mesh.as_pointer())
+    signature = get_mesh_signature(mesh)
+
+    entry = bvh_cache.get(key)
+
+    if entry:
+        if entry['signature'] == signature:
+            bvh_cache.move_to_end(key)
+            return entry['bvh']
+
+        del bvh_cache[key]
+
+    bm = bmesh.new()
+    bm.from_mesh(mesh)
+
+    bvh = BVH.FromBMesh(bm)
+    bm.free()
+
+    bvh_cache[key] = {'signature': signature,
+                      'bvh': bvh,
+
+                      # rough estimate of the bvh memory footprint, ~128 bytes per element
+                      'size': (len(mesh.vertices) + len(mesh.loops)) * 128}
+
+    evict_bvhs(keep=key)
+
+    return bvh
+
+
+def get_mesh_signature(mesh):
+    '''
+    return the element counts of the mesh, along with a hash of its vertex coordinates and face loops
+    unlike the counts alone, this also catches verts being moved, and faces being rebuilt with the same number of elements
+    '''
+
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', coords)
+
+    loops = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get('vertex_index', loops)
+
+    return len(mesh.vertices), len(mesh.edges), len(mesh.polygons), len(mesh.loops), hash(coords.tobytes()), hash(loops.tobytes())
+
+
+def evict_bvhs(keep=None):
+    '''
+    drop the least recently used entries until the cache fits into the memory budget set in the addon prefs
+    '''
+
+    budget = get_prefs().bvh_cache_budget * 1024 ** 2
+    size = sum(entry['size'] for entry in bvh_cache.values())
+
+    for key in list(bvh_cache):
+        if size <= budget:
+            break
+
+        if key != keep:
+            size -= bvh_cache.pop(key)['size']
+
+
+def get_evaluated_bvh(source, owner):
+    '''
+    return BVH of evaluated geometry, along with an array mapping its triangle indices to polygon indices, like the ones returned by scene.ray_cast()
+    the source is either an evaluated mesh, which may be shared by several instances, or an evaluated non-mesh object, which is converted to a mesh first
+    entries are keyed by the source's pointer, and are validated on every call by the element counts of evaluated meshes
+    the owner is the name of the original object the geometry belongs to, used to invalidate the entry, when that object's geometry is updated
+    return None, None for sources that don't produce any faces
+    '''
+
+    key = ('EVALUATED', source.as_pointer())
+    is_mesh = isinstance(source, bpy.types.Mesh)
+    signature = (len(source.vertices), len(source.polygons), len(source.loops)) if is_mesh else None
+
+    entry = bvh_cache.get(key)
+
+    if entry:
+        if entry['owner'] == owner and (signature is None or entry['signature'] == signature):
+            bvh_cache.move_to_end(key)
+            return entry['bvh'], entry['tri_faces']
+
+        del bvh_cache[key]
+
+    mesh = source if is_mesh else source.to_mesh()
+
+    mesh.calc_loop_triangles()
+
+    vert_count = len(mesh.vertices)
+    tri_count = len(mesh.loop_triangles)
+
+    bvh = None
+    tri_faces = None
+
+    if tri_count:
+        coords = np.empty(vert_count * 3, dtype=np.float64)
+        mesh.vertices.foreach_get('co', coords)
+
+        tris = np.empty(tri_count * 3, dtype=np.int32)
+        mesh.loop_triangles.foreach_get('vertices', tris)
+
+        tri_faces = np.empty(tri_count, dtype=np.int32)
+        mesh.loop_triangles.foreach_get('polygon_index', tri_faces)
+
+        bvh = BVH.FromPolygons(coords.reshape(-1, 3).tolist(), tris.reshape(-1, 3).tolist(), all_triangles=True)
+
+    if not is_mesh:
+        source.to_mesh_clear()
+
+    bvh_cache[key] = {'signature': signature,
+                      'owner': owner,
+                      'bvh': bvh,
+                      'tri_faces': tri_faces,
+                      'size': (vert_count + tri_count) * 128}
+
+    evict_bvhs(keep=key)
+
+    return bvh, tri_faces
+
+
+def invalidate_bvh(id=None):
+    '''
+    drop the cached BVHs of the passed in mesh, the cached evaluated BVH of the passed in object, or all of them
+    '''
+
+    if id is None:
+        keys = list(bvh_cache)
+
+    elif isinstance(id, bpy.types.Object):
+        keys = [key for key, entry in bvh_cache.items() if key[0] == 'EVALUATED' and entry.get('owner') == id.name]
+
+    else:
+        pointer = id.as_pointer()
+        keys = [key for key in bvh_cache if key[1] == pointer]
+
+    for key in keys:
+        bvh_cache.pop(key, None)
+
+
+# BOUNDS
+
+def get_world_aabb(obj, depsgraph=None):
+    '''
+    return the world space axis aligned bounding box of the object as min and max arrays
+    with a depsgraph, it's the box of the evaluated object, otherwise the box of the original mesh, so it matches the data queried by obj.ray_cast() and obj.closest_point_on_mesh()
+    it's cached by object pointer, and only recalculated when the object's world matrix changed or it was invalidated due to a geometry change
+    '''
+
+    key = (obj.as_pointer(), depsgraph is not None)
+
+    mx = obj.matrix_world
+    entry = aabb_cache.get(key)
+
+    if entry and entry[0] == mx:
+        return entry[1], entry[2]
+
+    mx_np = np.array(mx)
+    corners = get_local_bounds(obj, depsgraph) @ mx_np[:3, :3].T + mx_np[:3, 3]
+
+    entry = aabb_cache[key] = (mx.copy(), corners.min(axis=0), corners.max(axis=0))
+    return entry[1], entry[2]
+
+
+def get_local_bounds(obj, depsgraph=None):
+    '''
+    return the 8 local space bounding box corners of the evaluated object, or of the original mesh, when no depsgraph is passed in
+    obj.bound_box can't be used for the latter, as it's always the one of the evaluated object
+    '''
+
+    if depsgraph:
+        return np.array(obj.evaluated_get(depsgraph).bound_box[:], dtype=np.float64)
+
+    mesh = obj.data
+
+    if not mesh.vertices:
+        return np.zeros((8, 3), dtype=np.float64)
+
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float64)
+    mesh.vertices.foreach_get('co', coords)
+    coords.shape = (-1, 3)
+
+    bbmin = coords.min(axis=0)
+    bbmax = coords.max(axis=0)
+
+    # all 8 corners, so the box can be transformed into world space like any other
+    return np.array([[x, y, z] for x in (bbmin[0], bbmax[0]) for y in (bbmin[1], bbmax[1]) for z in (bbmin[2], bbmax[2])], dtype=np.float64)
+
+
+def get_world_aabbs(objects, depsgraph=None):
+    '''
+    return the stacked min and max bounding box corners of all passed in objects
+    '''
+
+    aabbs = [get_world_aabb(obj, depsgraph) for obj in objects]
+
+    mins = np.array([aabb[0] for aabb in aabbs], dtype=np.float64).reshape(-1, 3)
+    maxs = np.array([aabb[1] for aabb in aabbs], dtype=np.float64).reshape(-1, 3)
+
+    return mins, maxs
+
+
+def get_aabbs_on_ray(objects, origin, direction, depsgraph=None, margin=0.0001):
+    '''
+    return (index, distance) tuples of all objects whose bounding box is hit by the ray, sorted by the distance at which the ray enters the box
+    '''
+
+    if not objects:
+        return []
+
+    mins, maxs = get_world_aabbs(objects, depsgraph)
+
+    return get_boxes_on_ray(mins, maxs, origin, direction, margin=margin)
+
+
+def get_boxes_on_ray(mins, maxs, origin, direction, margin=0.0001):
+    '''
+    return (index, distance) tuples of all the passed in stacked bounding boxes hit by the ray, sorted by the distance at which the ray enters the box
+    '''
+
+    origin = np.array(origin)
+    direction = np.array(direction)
+
+    # slab test, axis parallel rays produce infs and nans, which fmin and fmax ignore
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t1 = (mins - margin - origin) / direction
+        t2 = (maxs + margin - origin) / direction
+
+    enter = np.nanmax(np.fmin(t1, t2), axis=1)
+    exit = np.nanmin(np.fmax(t1, t2), axis=1)
+
+    hit = exit >= np.maximum(enter, 0)
+
+    indices = hit.nonzero()[0]
+    distances = np.maximum(enter[indices], 0)
+
+    order = np.argsort(distances)
+
+    return list(zip(indices[order].tolist(), distances[order].tolist()))
+
+
+def get_stacked_world_bounds(bound_boxes, matrices):
+    '''
+    transform the stacked local bounding box corners by the stacked world matrices, and return the world space min and max corners
+    '''
+
+    if not len(bound_boxes):
+        return np.empty((0, 3)), np.empty((0, 3))
+
+    corners = np.einsum('nij,nkj->nki', matrices[:, :3, :3], bound_boxes) + matrices[:, None, :3, 3]
+
+    return corners.min(axis=1), corners.max(axis=1)
+
+
+def get_aabbs_by_distance(objects, point, depsgraph=None):
+    '''
+    return (index, distance) tuples of all objects, sorted by the distance of the point to their bounding box
+    '''
+
+    if not objects:
+        return []
+
+    mins, maxs = get_world_aabbs(objects, depsgraph)
+
+    point = np.array(point)
+    distances = np.linalg.norm(np.maximum(np.maximum(mins - point, point - maxs), 0), axis=1)
+
+    order = np.argsort(distances)
+
+    return list(zip(order.tolist(), distances[order].tolist()))
+
+
+def invalidate_aabb(obj=None):
+    if obj is None:
+        aabb_cache.clear()
+
+    else:
+        pointer = obj.as_pointer()
+
+        aabb_cache.pop((pointer, True), None)
+        aabb_cache.pop((pointer, False), None)
+
+
+def get_world_bvh(objects, depsgraph):
+    '''
+    create a single BVH from the evaluated triangles of all passed in mesh objects, in world space
+    '''
+
+    coords = []
+    tris = []
+
+    vert_offset = 0
+
+    for obj in objects:
+        obj_eval = obj.evaluated_get(depsgraph)
+
+        mesh = obj_eval.to_mesh()
+        mesh.calc_loop_triangles()
+
+        vert_count = len(mesh.vertices)
+        tri_count = len(mesh.loop_triangles)
+
+        if tri_count:
+            co = np.empty((vert_count, 3), dtype=np.float64)
+            mesh.vertices.foreach_get('co', np.reshape(co, vert_count * 3))
+
+            mx = np.array(obj_eval.matrix_world)
+            coords.append(co @ mx[:3, :3].T + mx[:3, 3])
+
+            indices = np.empty((tri_count, 3), dtype=np.int64)
+            mesh.loop_triangles.foreach_get('vertices', np.reshape(indices, tri_count * 3))
+
+            # baking a negatively scaled object into world space flips the winding, and so its normals, so flip it back
+            if np.linalg.det(mx[:3, :3]) < 0:
+                indices = indices[:, ::-1]
+
+            tris.append(indices + vert_offset)
+
+            vert_offset += vert_count
+
+        obj_eval.to_mesh_clear()
+
+    if tris:
+        return BVH.FromPolygons(np.concatenate(coords).tolist(), np.concatenate(tris).tolist(), all_triangles=True)
 
 
 # RAYCASTING BVH
 
-def cast_bvh_ray_from_mouse(mousepos, candidates=None, bmeshes={}, bvhs={}, debug=False):
+def cast_bvh_ray_from_mouse(mousepos, candidates=None, debug=False):
     region = bpy.context.region
     region_data = bpy.context.region_data
 
@@ -22,8 +364,8 @@ def cast_bvh_ray_from_mouse(mousepos, candidates=None, bmeshes={}, bvhs={}, debu
     hitindex = None
     hitdistance = sys.maxsize
 
-    cache = {'bmesh': {},
-             'bvh': {}}
+    # the bvhs used, they are shared with the module's bvh cache, but stay valid even once they are evicted from it
+    cache = {'bvh': {}}
 
     for obj, src in objects:
         mx = obj.matrix_world
@@ -32,24 +374,8 @@ def cast_bvh_ray_from_mouse(mousepos, candidates=None, bmeshes={}, bvhs={}, debu
         ray_origin = mxi @ origin_3d
         ray_direction = mxi.to_3x3() @ vector_3d
 
-        # use cached bmesh if possible
-        if obj.name in bmeshes:
-            # print("fetching existing bmesh")
-            bm = bmeshes[obj.name]
-        else:
-            # print("creating new bmesh")
-            bm = bmesh.new()
-            bm.from_mesh(obj.data)
-            cache['bmesh'][obj.name] = bm
-
-        # use cached bvh if possible
-        if obj.name in bvhs:
-            # print("fetching exsiting BVH")
-            bvh = bvhs[obj.name]
-        else:
-            # print("creating new BVH")
-            bvh = BVH.FromBMesh(bm)
-            cache['bvh'][obj.name] = bvh
+        bvh = get_bvh(obj)
+        cache['bvh'][obj.name] = bvh
 
         location, normal, index, distance = bvh.ray_cast(ray_origin, ray_direction)
 
@@ -97,7 +423,13 @@ def cast_obj_ray_from_mouse(mousepos, depsgraph=None, candidates=None, debug=Fal
     hitindex = None
     hitdistance = sys.maxsize
 
-    for obj in objects:
+    # only cast against objects whose bounding box is hit, nearest first, and stop once the boxes are further away than the best hit
+    for idx, boxdistance in get_aabbs_on_ray(objects, origin_3d, vector_3d, depsgraph):
+        if boxdistance > hitdistance:
+            break
+
+        obj = objects[idx]
+
         mx = obj.matrix_world
         mxi = mx.inverted_safe()
 
@@ -137,7 +469,12 @@ def get_closest(origin, candidates=[], depsgraph=None, debug=False):
 
     objects = [obj for obj in candidates if obj.type == 'MESH']
 
-    for obj in objects:
+    # check the objects in order of their bounding box distance, and stop once the boxes are further away than the nearest point found
+    for idx, boxdistance in get_aabbs_by_distance(objects, origin, depsgraph):
+        if boxdistance > nearestdistance:
+            break
+
+        obj = objects[idx]
         mx = obj.matrix_world
 
         origin_local = mx.inverted_safe() @ origin
@@ -175,59 +512,256 @@ def get_closest(origin, candidates=[], depsgraph=None, debug=False):
 
 # SCENE RAYCASTING
 
-def cast_scene_ray_from_mouse(mousepos, depsgraph, exclude=[], exclude_wire=False, unhide=[], debug=False):
+def get_scene_candidates(depsgraph):
+    '''
+    return list of (obj, source, mx, mxi) for every visible geometry instance in the depsgraph, along with the world space min and max corners of their bounding boxes
+    obj is the original object, used for filtering and reported on hits, source is the instance's own evaluated geometry, see get_evaluated_bvh()
+    instance objects are only valid while iterating, so the evaluated mesh is kept for mesh instances, which stays valid until its object is evaluated again
+
+    the list is cached per depsgraph, and kept up to date by update_scene_candidates()
+    the entries of objects, whose transform or geometry was updated, are refreshed in place, everything else is only rebuilt when needed
+    '''
+
+    key = depsgraph.as_pointer()
+    cache = scene_candidates.get(key)
+
+    if cache and not cache['rebuild'] and cache['visibility']:
+        cache['visibility'] = False
+
+        if get_visibility_signature(depsgraph) != cache['signature']:
+            cache['rebuild'] = True
+
+    if cache and not cache['rebuild'] and cache['updated']:
+        cache['rebuild'] = not refresh_scene_candidates(cache, depsgraph)
+
+    if not cache or cache['rebuild']:
+        cache = scene_candidates[key] = build_scene_candidates(depsgraph)
+
+    return cache['candidates'], cache['mins'], cache['maxs']
+
+
+def build_scene_candidates(depsgraph):
+    '''
+    iterate over all depsgraph instances and collect the candidates of get_scene_candidates()
+    objects maps the pointers of the non-instanced objects to their candidate index, so their entries can be refreshed individually
+    instanced holds the pointers of the instanced objects and of their instancers, any update of those requires iterating the instances again
+    '''
+
+    candidates = []
+    bound_boxes = []
+    matrices = []
+
+    objects = {}
+    instanced = set()
+
+    for instance in depsgraph.object_instances:
+        obj_eval = instance.object
+
+        if obj_eval.type in ['MESH', 'CURVE', 'SURFACE', 'FONT']:
+            obj = obj_eval.original
+            source = obj_eval.data if obj_eval.type == 'MESH' else obj.evaluated_get(depsgraph)
+
+            if instance.is_instance:
+                instanced.add(obj.as_pointer())
+                instanced.add(instance.parent.original.as_pointer())
+
+            else:
+                objects[obj.as_pointer()] = len(candidates)
+
+            mx = instance.matrix_world.copy()
+            candidates.append((obj, source, mx, mx.inverted_safe()))
+
+            bound_boxes.append(obj_eval.bound_box[:])
+            matrices.append(mx)
+
+    mins, maxs = get_stacked_world_bounds(np.array(bound_boxes, dtype=np.float64).reshape(-1, 8, 3), np.array(matrices, dtype=np.float64).reshape(-1, 4, 4))
+
+    return {'candidates': candidates,
+            'mins': mins,
+            'maxs': maxs,
+            'objects': objects,
+            'instanced': instanced,
+            'signature': get_visibility_signature(depsgraph),
+
+            # the pending changes, collected by update_scene_candidates()
+            'updated': set(),
+            'visibility': False,
+            'rebuild': False}
+
+
+def refresh_scene_candidates(cache, depsgraph):
+    '''
+    refresh the matrices, sources and bounds of the updated objects in place
+    return False, if that's not possible, because an instancer or instanced object was updated, or an object was removed
+    '''
+
+    candidates = cache['candidates']
+    updated = cache['updated']
+
+    if not updated.isdisjoint(cache['instanced']):
+        return False
+
+    for pointer in updated:
+        idx = cache['objects'].get(pointer)
+
+        if idx is not None:
+            obj = candidates[idx][0]
+
+            try:
+                obj_eval = obj.evaluated_get(depsgraph)
+
+            except ReferenceError:
+                return False
+
+            source = obj_eval.data if obj_eval.type == 'MESH' else obj_eval
+
+            mx = obj_eval.matrix_world.copy()
+            candidates[idx] = (obj, source, mx, mx.inverted_safe())
+
+            mins, maxs = get_stacked_world_bounds(np.array(obj_eval.bound_box[:], dtype=np.float64).reshape(1, 8, 3), np.array(mx, dtype=np.float64).reshape(1, 4, 4))
+
+            cache['mins'][idx] = mins[0]
+            cache['maxs'][idx] = maxs[0]
+
+    updated.clear()
+    return True
+
+
+def get_visibility_signature(depsgraph):
+    '''
+    return the pointers of all visible objects of the depsgraph's view layer
+    '''
+
+    view_layer = depsgraph.view_layer
+    return frozenset(obj.as_pointer() for obj in view_layer.objects if obj.visible_get(view_layer=view_layer))
+
+
+def update_scene_candidates(depsgraph):
+    '''
+    collect the changes of the depsgraph updates, that affect the cached scene candidates, to be applied on the next get_scene_candidates() call
+    transform and geometry updates only mark their objects, other object and scene updates may have changed the visibility, which is verified then
+    collection updates can add or remove objects and instances anywhere, so they always require a rebuild
+    '''
+
+    if not scene_candidates:
+        return
+
+    updated = set()
+    visibility = False
+    rebuild = False
+
+    for update in depsgraph.updates:
+        id = update.id
+
+        if isinstance(id, bpy.types.Object):
+            if update.is_updated_transform or update.is_updated_geometry:
+                updated.add(id.original.as_pointer())
+
+            else:
+                visibility = True
+
+        elif isinstance(id, bpy.types.Scene):
+            visibility = True
+
+        elif isinstance(id, bpy.types.Collection):
+            rebuild = True
+
+    for cache in scene_candidates.values():
+        cache['updated'] |= updated
+        cache['visibility'] |= visibility
+        cache['rebuild'] |= rebuild
+
+
+def invalidate_scene_candidates():
+    scene_candidates.clear()
+
+
+def get_scene_ray_hits_from_mouse(mousepos, depsgraph, include=None, exclude=[], exclude_wire=False, unhide=[], nearest=False, debug=False):
+    '''
+    cast a ray against the BVHs of all visible scene objects and return the nearest hit of each one, as a list of tuples sorted by distance
+    (distance, obj, index, location, normal, mx)
+
+    objects are filtered by the include and exclude lists, and optionally wire display, instead of temporarily hiding them
+    the hidden objects in the unhide list are cast against as well, using the BVHs of their original meshes
+
+    only objects whose bounding box is hit are cast against, nearest box first, so BVHs are only created for those
+    with nearest, stop once the boxes are further away than the nearest hit, so only that one is returned
+    '''
+
     region = bpy.context.region
     region_data = bpy.context.region_data
 
     view_origin = region_2d_to_origin_3d(region, region_data, mousepos)
     view_dir = region_2d_to_vector_3d(region, region_data, mousepos)
 
-    scene = bpy.context.scene
+    exclude = set(exclude)
+    include = set(include) if include else None
+
+    candidates, mins, maxs = get_scene_candidates(depsgraph)
+
+    if unhide:
+        candidates = candidates + [(obj, None, obj.matrix_world, obj.matrix_world.inverted_safe()) for obj in unhide]
 
-    # temporary unhide obects in the unhide list, usefuly if you want to self.snap edit mesh objects, which is achieved by excluding the active object and snapping on an unchanging duplicate that is hidden
-    for ob in unhide:
-        ob.hide_set(False)
+        unhide_mins, unhide_maxs = get_stacked_world_bounds(np.array([obj.bound_box[:] for obj in unhide], dtype=np.float64), np.array([obj.matrix_world for obj in unhide], dtype=np.float64))
 
-    # initial cast
-    hit, location, normal, index, obj, mx = scene.ray_cast(depsgraph=depsgraph, origin=view_origin, direction=view_dir)
+        mins = np.concatenate((mins, unhide_mins))
+        maxs = np.concatenate((maxs, unhide_maxs))
 
+    hits = []
+    hitdistance = sys.maxsize
+
+    for idx, boxdistance in get_boxes_on_ray(mins, maxs, view_origin, view_dir):
+        if nearest and boxdistance > hitdistance:
+            break
+
+        obj, source, mx, mxi = candidates[idx]
+
+        if obj in exclude or (include is not None and obj not in include) or (exclude_wire and obj.display_type == 'WIRE'):
+            continue
+
+        if source is None:
+            bvh = get_bvh(obj)
+            tri_faces = None
+
+        else:
+            bvh, tri_faces = get_evaluated_bvh(source, obj.name)
+
+        if bvh:
+            location, normal, index, _ = bvh.ray_cast(mxi @ view_origin, mxi.to_3x3() @ view_dir)
+
+            if location:
+                location = mx @ location
+                normal = (mxi.transposed().to_3x3() @ normal).normalized()
+                distance = (location - view_origin).length
 
-    # objects are excluded by temporary hiding them, collect them to reveal them at the end
-    hidden = []
+                if tri_faces is not None:
+                    index = int(tri_faces[index])
 
-    # additional casts in case the hit object should be excluded
-    if hit:
-        if obj in exclude or (exclude_wire and obj.display_type == 'WIRE'):
-            ignore = True
+                hits.append((distance, obj, index, location, normal, mx))
+                hitdistance = min(hitdistance, distance)
 
-            while ignore:
-                if debug:
-                    print(" Ignoring object", obj.name)
+    hits.sort(key=lambda x: x[0])
 
-                # temporarily hide and collect excluded object
-                obj.hide_set(True)
-                hidden.append(obj)
+    if nearest:
+        hits = hits[:1]
 
-                hit, location, normal, index, obj, mx = scene.ray_cast(depsgraph=depsgraph, origin=view_origin, direction=view_dir)
+    if debug:
+        for distance, obj, index, location, normal, _ in hits:
+            print(f" {distance:.6f}", obj.name, index, location, normal)
+
+    return hits
 
-                if hit:
-                    ignore = obj in exclude or (exclude_wire and obj.display_type == 'WIRE')
-                else:
-                    break
 
-    # hide the unhide objects again
-    for ob in unhide:
-        ob.hide_set(True)
+def cast_scene_ray_from_mouse(mousepos, depsgraph, exclude=[], exclude_wire=False, unhide=[], debug=False):
+    hits = get_scene_ray_hits_from_mouse(mousepos, depsgraph, exclude=exclude, exclude_wire=exclude_wire, unhide=unhide, nearest=True)
 
-    # reveal hidden objects again
-    for ob in hidden:
-        ob.hide_set(False)
+    if hits:
+        _, obj, index, location, normal, mx = hits[0]
 
-    if hit:
         if debug:
             print(obj.name, index, location, normal)
 
-        return hit, obj, index, location, normal, mx
+        return True, obj, index, location, normal, mx
 
     else:
         if debug:
@@ -1,7 +1,9 @@
 import bpy
 from bpy.utils import register_class, unregister_class, previews
 import os
+import re
 from importlib import import_module
+from time import perf_counter
 from .. registration import keys as keysdict
 from .. registration import classes as classesdict
 from .. msgbus import group_name_change, group_color_change
@@ -19,31 +21,60 @@ def get_prefs():
     return bpy.context.preferences.addons[get_name()].preferences
 
 
+# installed addons by name, mapped to foldername, version and path
+addon_registry = {}
+
+# the number of enabled addons, when the registry was built, enabling or disabling an addon changes it
+addon_registry_signature = None
+
+
+def get_addon_registry():
+    '''
+    scanning the installed addons via addon_utils.modules() is slow with many addons installed, so it's only done when addons have been enabled or disabled since
+    '''
+
+    global addon_registry_signature
+
+    signature = len(bpy.context.preferences.addons)
+
+    if signature != addon_registry_signature:
+        import addon_utils
+
+        addon_registry.clear()
+
+        for mod in addon_utils.modules():
+            name = mod.bl_info["name"]
+
+            # like before, the first addon of a given name wins
+            if name not in addon_registry:
+                addon_registry[name] = (mod.__name__, mod.bl_info.get("version", None), mod.__file__)
+
+        addon_registry_signature = signature
+
+    return addon_registry
+
+
 def get_addon(addon, debug=False):
     """
     look for addon by name
     return registration status, foldername, version and path
     """
-    import addon_utils
 
+    entry = get_addon_registry().get(addon)
 
-    for mod in addon_utils.modules():
-        name = mod.bl_info["name"]
-        version = mod.bl_info.get("version", None)
-        foldername = mod.__name__
-        path = mod.__file__
-        enabled = addon_utils.check(foldername)[1]
+    if entry:
+        foldername, version, path = entry
+        enabled = foldername in bpy.context.preferences.addons
 
-        if name == addon:
-            if debug:
-                print(name)
-                print("  enabled:", enabled)
-                print("  folder name:", foldername)
-                print("  version:", version)
-                print("  path:", path)
-                print()
-
-            return enabled, foldername, version, path
+        if debug:
+            print(addon)
+            print("  enabled:", enabled)
+            print("  folder name:", foldername)
+            print("  version:", version)
+            print("  path:", path)
+            print()
+
+        return enabled, foldername, version, path
     return False, None, None, None
 
 
@@ -71,26 +102,104 @@ def get_addon_prefs(addon):
 
 # CLASS REGISTRATION
 
-def register_classes(classlists, debug=False):
+# time in seconds it took to import and register each tool's or pie's classes, by classesdict label
+registration_timings = {}
+
+# menu labels by bl_idname, per module, read from the module source
+menu_labels = {}
+
+
+def register_classes(classlists, lazy=False, debug=False):
+    '''
+    import and register the classes of each classlist, and time it per tool or pie
+    with lazy, the pie menus are registered as stand-ins, that import ui/pies.py only once a pie is drawn for the first time
+    '''
+
     classes = []
 
     for classlist in classlists:
+        start = perf_counter()
+
+        classlist_classes = []
+
         for fr, imps in classlist:
-            impline = "from ..%s import %s" % (fr, ", ".join([i[0] for i in imps]))
-            classline = "classes.extend([%s])" % (", ".join([i[0] for i in imps]))
+            if lazy and fr == 'ui.pies':
+                classlist_classes.extend([get_lazy_menu(fr, name, idname) for name, idname in imps])
 
-            exec(impline)
-            exec(classline)
+            else:
+                module = import_module(f"..{fr}", __package__)
+                classlist_classes.extend([getattr(module, name) for name, _ in imps])
 
-    for c in classes:
-        if debug:
-            print("REGISTERING", c)
+        for c in classlist_classes:
+            if debug:
+                print("REGISTERING", c)
 
-        register_class(c)
+            register_class(c)
+
+        classes.extend(classlist_classes)
+
+        label = get_classlist_label(classlist)
+
+        if label:
+            registration_timings[label] = perf_counter() - start
 
     return classes
 
 
+def get_classlist_label(classlist):
+    for label, cl in classesdict.items():
+        if cl is classlist:
+            return label
+
+
+def get_lazy_menu(fr, name, idname):
+    '''
+    create a light weight stand-in for a menu class, registered under the same bl_idname and label
+    on first draw it imports the actual menu class, takes over its methods and then draws it, from then on it behaves like the actual class
+    '''
+
+    bl_idname = f"MACHIN3_MT_{idname}"
+
+    def draw(self, context):
+        cls = type(self)
+        menu = getattr(import_module(f"..{fr}", __package__), name)
+
+        for attr, value in vars(menu).items():
+            if not attr.startswith(('__', 'bl_')):
+                setattr(cls, attr, value)
+
+        print(f"INFO: Imported {bl_idname} on demand")
+
+        cls.draw(self, context)
+
+    return type(name, (bpy.types.Menu, ), {'bl_idname': bl_idname,
+                                           'bl_label': get_menu_labels(fr).get(bl_idname, name),
+                                           'draw': draw})
+
+
+def get_menu_labels(fr):
+    '''
+    read the bl_labels of the menus in a module from its source, which is a lot cheaper than importing it
+    '''
+
+    if fr not in menu_labels:
+        with open(os.path.join(get_path(), *fr.split('.')) + '.py') as f:
+            source = f.read()
+
+        menu_labels[fr] = dict(re.findall(r'bl_idname = "(MACHIN3_MT_\w+)"\s+bl_label = "([^"]*)"', source))
+
+    return menu_labels[fr]
+
+
+def print_registration_timings():
+    print("\nMACHIN3tools registration")
+
+    for label, duration in sorted(registration_timings.items(), key=lambda x: x[1], reverse=True):
+        print(f" {label.replace('_', ' ').title()}: {duration * 1000:.2f}ms")
+
+    print(f" Total: {sum(registration_timings.values()) * 1000:.2f}ms")
+
+
 def unregister_classes(classes, debug=False):
     for c in classes:
         if debug:
@@ -255,7 +364,7 @@ def activate(self, register, tool):
         # CLASSES
 
         # register tool/pie class
-        classes = register_classes(classlist, debug=debug)
+        classes = register_classes(classlist, lazy=get_prefs().lazy_pie_registration, debug=debug)
 
 
         # update classes registered in __init__.py at startup, necessary for addon unregistering
@@ -499,8 +608,6 @@ def get_pie_menus():
 
 def get_smart_vert(classlists=[], keylists=[], count=0):
     if get_prefs().activate_smart_vert:
-        from .. operators.smart_vert import SmartVert
-
         classlists.append(classesdict["SMART_VERT"])
         keylists.append(keysdict["SMART_VERT"])
         count +=1
@@ -510,8 +617,6 @@ def get_smart_vert(classlists=[], keylists=[], count=0):
 
 def get_smart_edge(classlists=[], keylists=[], count=0):
     if get_prefs().activate_smart_edge:
-        from .. operators.smart_edge import SmartEdge
-
         classlists.append(classesdict["SMART_EDGE"])
         keylists.append(keysdict["SMART_EDGE"])
         count +=1
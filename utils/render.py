@@ -0,0 +1,220 @@
+import os
+import csv
+import numpy as np
+
+try:
+    import OpenImageIO as oiio
+
+except ImportError:
+    oiio = None
+
+
+# SEED WORKERS
+
+# executed by each background blender process, via --python-expr
+# the view layer, the cryptomatte pass states and the jobs are passed in as json after the -- separator, the jobs as a list of (seed, path, composite) entries
+# the cryptomatte passes are only rendered for the composited job, which exports the cryptomatte, all other jobs use the passes as originally set up
+seed_worker_script = '''
+import bpy
+import sys
+import json
+
+args = json.loads(sys.argv[sys.argv.index('--') + 1])
+scene = bpy.context.scene
+view_layer = scene.view_layers[args['view_layer']]
+
+for seed, path, composite in args['jobs']:
+    scene.cycles.seed = seed
+    scene.render.use_compositing = composite
+
+    view_layer.use_pass_cryptomatte_object, view_layer.use_pass_cryptomatte_material, view_layer.use_pass_cryptomatte_asset = [True] * 3 if composite else args['crypto_passes']
+
+    bpy.ops.render.render(animation=False, write_still=False, use_viewport=False, layer='', scene='')
+    bpy.data.images['Render Result'].save_render(filepath=path)
+
+    print(f"M3_SEED_RENDERED {seed}", flush=True)
+'''
+
+
+def read_worker_output(process, idx, messages):
+    '''
+    forward each line a worker process prints to the messages queue, tagged with the worker index
+    runs in a separate thread per worker, and returns once the process closes its stdout
+    '''
+
+    for line in process.stdout:
+        messages.put((idx, line))
+
+    process.stdout.close()
+
+
+# SEED COMBINE
+
+# the number of floats combined at once, per seed
+tile_size = 2 ** 22
+
+
+def get_seed_readers(paths):
+    '''
+    open the seed files via OpenImageIO, so they can be read row by row, instead of loading entire images
+    return None, if OpenImageIO isn't available, which is only bundled with more recent Blender versions, or if the files aren't plain RGB(A) images of the same size, like multilayer EXRs
+    '''
+
+    if oiio is None:
+        return
+
+    readers = []
+
+    for path in paths:
+        reader = oiio.ImageInput.open(path)
+
+        if reader:
+            readers.append(reader)
+
+            spec = reader.spec()
+            first = readers[0].spec()
+
+            if (spec.width, spec.height) == (first.width, first.height) and tuple(spec.channelnames[:3]) == ('R', 'G', 'B'):
+                continue
+
+        for reader in readers:
+            reader.close()
+
+        return
+
+    return readers
+
+
+def read_seed_rows(reader, start, end):
+    '''
+    read the rows from start to end of the seed image as RGBA float32 pixels of shape (rows, width, 4)
+    the rows are counted from the bottom, like in Blender's image pixels, while files store them from the top
+    '''
+
+    spec = reader.spec()
+    channels = min(spec.nchannels, 4)
+
+    rows = reader.read_scanlines(0, 0, spec.height - end, spec.height - start, 0, 0, channels, oiio.FLOAT)
+
+    if rows is None:
+        raise IOError(f"Reading seed rendering failed: {reader.geterror()}")
+
+    pixels = np.ones((end - start, spec.width, 4), dtype=np.float32)
+    pixels[:, :, :channels] = rows[::-1]
+
+    return pixels
+
+
+def combine_seed_images(images, paths, mode='MIN'):
+    '''
+    combine the pixels of the passed in seed images, keeping either the minimum or the median of all seeds per pixel, removing fireflies
+    like the DARKEN mix nodes previously used in the compositor, only the color is combined, and the alpha of the first seed is kept
+
+    if possible, the seed files are streamed in tiles of rows, so only a tile of each seed is held in memory at any time, see get_seed_readers()
+    otherwise the images are read via Blender, one at a time, so for the minimum only two pixel buffers are held in memory, but for the median all of them
+
+    returns the combined RGBA pixels as a float32 array of shape (height, width, 4)
+    along with whether the values are the ones stored in the files, as opposed to the linearized float buffers Blender creates for float images
+    '''
+
+    readers = get_seed_readers(paths)
+
+    if readers:
+        width, height = readers[0].spec().width, readers[0].spec().height
+
+        result = np.empty((height, width, 4), dtype=np.float32)
+        rowcount = max(1, tile_size // (width * 4))
+
+        try:
+            for start in range(0, height, rowcount):
+                end = min(start + rowcount, height)
+                tile = result[start:end]
+
+                if mode == 'MEDIAN':
+                    stack = np.stack([read_seed_rows(reader, start, end) for reader in readers])
+                    np.median(stack, axis=0, out=tile)
+
+                    first = stack[0]
+
+                else:
+                    first = read_seed_rows(readers[0], start, end)
+                    tile[:] = first
+
+                    for reader in readers[1:]:
+                        np.minimum(tile, read_seed_rows(reader, start, end), out=tile)
+
+                tile[:, :, 3] = first[:, :, 3]
+
+        finally:
+            for reader in readers:
+                reader.close()
+
+        return result, True
+
+    width, height = images[0].size
+    channels = images[0].channels
+
+    size = width * height * channels
+    result = np.empty(size, dtype=np.float32)
+
+    if mode == 'MEDIAN':
+        stack = np.empty((len(images), size), dtype=np.float32)
+
+        for idx, img in enumerate(images):
+            img.pixels.foreach_get(stack[idx])
+            img.buffers_free()
+
+        # reduce tile by tile, to keep the temporary arrays of the median small
+        for start in range(0, size, tile_size):
+            np.median(stack[:, start:start + tile_size], axis=0, out=result[start:start + tile_size])
+
+        alpha = stack[0].reshape(-1, channels)[:, 3] if channels == 4 else None
+
+    else:
+        images[0].pixels.foreach_get(result)
+        images[0].buffers_free()
+
+        alpha = result.reshape(-1, channels)[:, 3].copy() if channels == 4 else None
+
+        buffer = np.empty(size, dtype=np.float32)
+
+        for img in images[1:]:
+            img.pixels.foreach_get(buffer)
+            img.buffers_free()
+
+            np.minimum(result, buffer, out=result)
+
+    if alpha is not None:
+        result.reshape(-1, channels)[:, 3] = alpha
+
+    result = result.reshape(height, width, channels)
+
+    # the pixels of new images are always RGBA
+    if channels == 3:
+        result = np.concatenate((result, np.ones((height, width, 1), dtype=np.float32)), axis=2)
+
+    return result, not images[0].is_float
+
+
+# TIMINGS
+
+def write_render_log(folder, info, timings, name='render_log.csv'):
+    '''
+    append the stage timings of a render to a csv log in the passed in folder, writing the header for a new log
+    each stage is written as its own row, prefixed by the render info, so the log can be filtered and compared easily
+    returns the path of the log
+    '''
+
+    path = os.path.join(folder, name)
+    exists = os.path.exists(path)
+
+    with open(path, 'a', newline='') as f:
+        writer = csv.writer(f)
+
+        if not exists:
+            writer.writerow(list(info.keys()) + ['stage', 'seconds'])
+
+        for stage, seconds in timings:
+            writer.writerow(list(info.values()) + [stage, f"{seconds:.3f}"])
+
+    return path
@@ -1,12 +1,10 @@
 import bpy
 import bmesh
+import numpy as np
+from mathutils import Vector
 from . raycast import cast_scene_ray_from_mouse
 
 
-# TODO: add update function to update/re-cache specific object
-# ####: used when the modifiers stack changes, like when HyperBevel adds/removes weld mods
-
-
 # TODO: somehow simplify the Cache structure into self.cache[name].bmeshes, instead of self.cache.bmeshes[name]?
 # ####: this would allow you to do cache = self.cache[name], and then just cache.bmeshes
 
@@ -16,6 +14,10 @@ from . raycast import cast_scene_ray_from_mouse
 # ####: you'd definitely also expose the view3d drawing coords then, mayby via a SnapDraw() object, or SnapCoords()?
 
 
+# the caches of all running snapping modals, kept up to date by the update_snap_caches() depsgraph handler, via refresh_snap_caches()
+snap_caches = []
+
+
 class Snap:
     def log(self, *args, **kwargs):
         if self.debug:
@@ -37,10 +39,15 @@ class Snap:
     hitnormal = None
     hitmx = None
 
-    hitface = None
+    _hitkey = None
+    _hitface = None
+    _hitfacekey = None
 
     _edit_mesh_objs = []
     _modifiers = []
+    _prewarm_objs = []
+    _prewarm_timer = None
+    _prewarm_interval = 0.01
 
     def __init__(self, context, include=None, exclude=None, exclude_wire=False, alternative=None, debug=False):
         self.debug = debug
@@ -61,20 +68,51 @@ class Snap:
         self.cache = SnapCache(debug=debug)
 
         # init hitface
-        self.hitface = None
+        self._hitkey = None
+        self._hitface = None
+        self._hitfacekey = None
+
+        self._prewarm_objs = []
+        self._prewarm_timer = None
 
         self.log()
 
     def finish(self):
         self.log("\nFinish Snapping")
 
+        if self._prewarm_timer and bpy.app.timers.is_registered(self._prewarm_timer):
+            bpy.app.timers.unregister(self._prewarm_timer)
+
         if self._modifiers:
             self._enable_modifiers()
 
         self._remove_alternatives()
 
+        self.log(f" Cache hits: {self.cache.stats['hits']}, misses: {self.cache.stats['misses']}, rebuilds: {self.cache.stats['rebuilds']}")
+
         self.cache.clear()
 
+        if self.cache in snap_caches:
+            snap_caches.remove(self.cache)
+
+    @property
+    def hitface(self):
+        '''
+        the bmesh face of the last hit, which stays around when nothing is hit
+        the bmesh of the hit object is only created, when this is accessed
+        the face is fetched again too, if the object has been refreshed in the meantime, freeing the previous bmesh
+        '''
+
+        if self._hitkey and (self._hitkey != self._hitfacekey or not self._hitface.is_valid):
+            name, index = self._hitkey
+
+            self.log("Hitface changed to", index)
+
+            self._hitface = self.cache.get_bmesh(name, self.depsgraph).faces[index]
+            self._hitfacekey = self._hitkey
+
+        return self._hitface
+
     def get_hit(self, mousepos):
         '''
         do a scene raycast from the passed in mouse position
@@ -85,60 +123,79 @@ class Snap:
         if self.hit:
             name = self.hitobj.name
 
-            # fetch the following once
+            # fetch the evaluated geometry once, and again only if the object's geometry has been updated since
 
-            if name not in self.cache.objects:
+            self.cache.ensure(self.hitobj, self.depsgraph)
 
-                # OBJECT
 
-                self.cache.objects[name] = self.hitobj
+            # update the following every time the hitface changes
 
+            # TODO: you may still encounter issues where the hitindex is not present in the current bmesh
+            # ####: if you encounter this, you should update the mesh/bmesh
 
-                # MESH
 
-                mesh = bpy.data.meshes.new_from_object(self.hitobj.evaluated_get(self.depsgraph), depsgraph=self.depsgraph)
-                self.cache.meshes[name] = mesh
+            # HITFACE
 
+            self._hitkey = (name, self.hitindex)
 
-                # BMESH
 
-                bm = bmesh.new()
-                bm.from_mesh(mesh)
-                # bm.normal_update()
-                bm.verts.ensure_lookup_table()
-                bm.faces.ensure_lookup_table()
-                self.cache.bmeshes[name] = bm
+            # TRI COORDS
 
+            if self.hitindex not in self.cache.tri_coords[name]:
+                self.log("Adding tri coords for face index", self.hitindex)
 
-                # LOOP TRIANGLES
+                tri_coords = self.cache.get_tri_coords(name, self.hitindex, self.hitmx)
+                self.cache.tri_coords[name][self.hitindex] = tri_coords
 
-                self.cache.loop_triangles[name] = bm.calc_loop_triangles()
-                self.cache.tri_coords[name] = {}
+                # only keep the coords of the most recently visited faces around
+                if len(self.cache.tri_coords[name]) > self.cache.max_tri_coords:
+                    del self.cache.tri_coords[name][next(iter(self.cache.tri_coords[name]))]
 
+    def prewarm(self, context, objects=None, mousepos=None, limit=8, create_bmesh=False, interval=0.01):
+        '''
+        cache the passed in objects, or the alternatives and up to limit visible mesh objects under or closest to the mouse, in a timer, while the modal is idle
+        one object is cached per timer tick, so event handling is never held up for longer than it takes to cache a single object
+        optionally create the bmeshes too, which is only worth it for the most likely snapping targets
+        objects are queued up, so this can be called repeatedly, with the most likely targets first
+        '''
 
-            # update the following every time the hitface changes
+        if objects is None:
+            candidates = [obj for obj in context.visible_objects if obj.type == 'MESH' and obj not in self.exclude and obj not in self.alternative]
+            objects = self.alternative + (get_objects_near_mouse(context, candidates, mousepos, limit) if mousepos else [])
 
-            # TODO: you may still encounter issues where the hitindex is not present in the current bmesh
-            # ####: if you encounter this, you should update the mesh/bmesh
+        self._prewarm_objs.extend((obj, create_bmesh) for obj in objects)
+        self._prewarm_interval = interval
 
+        if self._prewarm_objs and not self._prewarm_timer:
+            self.log(f" Prewarming {len(self._prewarm_objs)} objects")
 
-            # HITFACE
+            # keep a reference to the bound method, so the very same timer can be unregistered again
+            self._prewarm_timer = self._prewarm
+            bpy.app.timers.register(self._prewarm_timer, first_interval=interval)
 
-            if not self.hitface or (self.hitface and self.hitface.index != self.hitindex):
-                self.log("Hitface changed to", self.hitindex)
+    def _prewarm(self):
+        while self._prewarm_objs:
+            obj, create_bmesh = self._prewarm_objs.pop(0)
 
-                self.hitface = self.cache.bmeshes[name].faces[self.hitindex]
+            try:
+                name = obj.name
 
+            # the object may have been removed in the meantime
+            except ReferenceError:
+                continue
 
-            # TRI COORDS
+            if name not in self.cache.objects:
+                self.cache.add(obj, self.depsgraph)
 
-            if self.hitindex not in self.cache.tri_coords[name]:
-                self.log("Adding tri coords for face index", self.hitindex)
+            elif not create_bmesh or name in self.cache.bmeshes:
+                continue
 
-                loop_triangles = self.cache.loop_triangles[name]
+            if create_bmesh:
+                self.cache.get_bmesh(name, self.depsgraph)
 
-                tri_coords = [self.hitmx @ l.vert.co for tri in loop_triangles if tri[0].face == self.hitface for l in tri]
-                self.cache.tri_coords[name][self.hitindex] = tri_coords
+            return self._prewarm_interval
+
+        self._prewarm_timer = None
 
     def _init_edit_mode(self, context):
         '''
@@ -234,6 +291,40 @@ class Snap:
             mod.show_viewport = True
 
 
+def get_objects_near_mouse(context, objects, mousepos, limit=8):
+    '''
+    return up to limit of the passed in objects, sorted by the screen space distance of their projected bounding boxes to the mouse
+    objects under the mouse have a distance of 0, and objects entirely behind the view are skipped
+    '''
+
+    if not objects:
+        return []
+
+    region = context.region
+    mousepos = np.array(mousepos, dtype=np.float32)
+
+    corners = np.array([obj.bound_box for obj in objects], dtype=np.float32)
+    mxs = np.array([obj.matrix_world for obj in objects], dtype=np.float32)
+
+    # project the bounding box corners of all objects at once, shape (objects, 8 corners, 4)
+    coords = np.concatenate([corners, np.ones((len(objects), 8, 1), dtype=np.float32)], axis=2)
+    clip = np.einsum('ij,njk,nak->nai', np.array(context.region_data.perspective_matrix, dtype=np.float32), mxs, coords)
+
+    in_front = clip[:, :, 3] > 0
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        screen = (clip[:, :, :2] / clip[:, :, 3:] * 0.5 + 0.5) * (region.width, region.height)
+
+    # the screen space bounds of the corners in front of the view
+    mins = np.where(in_front[:, :, None], screen, np.inf).min(axis=1)
+    maxs = np.where(in_front[:, :, None], screen, -np.inf).max(axis=1)
+
+    distances = np.linalg.norm(np.maximum(np.maximum(mins - mousepos, mousepos - maxs), 0), axis=1)
+    distances[~in_front.any(axis=1)] = np.inf
+
+    return [objects[idx] for idx in np.argsort(distances, kind='stable')[:limit] if distances[idx] != np.inf]
+
+
 class SnapCache:
     def log(self, *args, **kwargs):
         if self.debug:
@@ -241,31 +332,185 @@ class SnapCache:
 
     debug = False
 
-    objects = {}
-    meshes = {}
+    objects = None
 
-    bmeshes = {}
+    bmeshes = None
 
-    loop_triangles = {}
-    tri_coords = {}
+    loop_triangles = None
+    tri_coords = None
+
+    stats = None
+
+    max_tri_coords = 1000
 
     def __init__(self, debug=False):
         self.debug = debug
         self.log(" Initialize SnappingCache")
 
-    def clear(self):
-        for name, mesh in self.meshes.items():
-            self.log(f" Removing {name}'s temporary snapping mesh {mesh.name} with {len(mesh.polygons)} faces and {len(mesh.vertices)} verts")
-            bpy.data.meshes.remove(mesh, do_unlink=True)
+        # the dicts are created per instance, so independent snapping modals don't share each other's objects
+        self.objects = {}
+
+        self.bmeshes = {}
+
+        self.loop_triangles = {}
+        self.tri_coords = {}
+
+        self.stats = {'hits': 0, 'misses': 0, 'rebuilds': 0}
+
+        snap_caches.append(self)
+
+    def ensure(self, obj, depsgraph):
+        '''
+        cache the passed in object, if it isn't already, and count cache hits and misses
+        '''
 
+        if obj.name in self.objects:
+            self.stats['hits'] += 1
+
+        else:
+            self.stats['misses'] += 1
+            self.add(obj, depsgraph)
+
+    def invalidate(self, obj):
+        '''
+        remove everything cached for the passed in object
+        the bmesh is freed, so any of its faces, like the Snap's hitface, become invalid
+        '''
+
+        name = obj.name
+
+        if name in self.bmeshes:
+            self.log(f" Freeing {name}'s temporary snapping bmesh")
+            self.bmeshes.pop(name).free()
+
+        self.objects.pop(name, None)
+
+        self.loop_triangles.pop(name, None)
+        self.tri_coords.pop(name, None)
+
+    def refresh(self, obj, depsgraph):
+        '''
+        re-cache an already cached object from its current evaluated state, like when its modifier stack has changed
+        the loop triangles are rebuilt right away, while the bmesh is only created again, when it's requested
+        '''
+
+        if obj.name in self.objects:
+            self.log(f" Refreshing {obj.name}")
+
+            self.stats['rebuilds'] += 1
+
+            self.invalidate(obj)
+            self.add(obj, depsgraph)
+
+    def add(self, obj, depsgraph):
+        '''
+        cache the evaluated loop triangles and vert coords of the passed in object in numpy arrays
+        the evaluated mesh is read directly, so no temporary mesh datablock is created, and the bmesh is only created on demand
+        note that evaluated_get() returns the original object, for objects that aren't part of the depsgraph
+        '''
+
+        name = obj.name
+        eval_obj = obj.evaluated_get(depsgraph)
+
+        self.objects[name] = obj
+
+        if eval_obj.type == 'MESH':
+            self.loop_triangles[name] = get_loop_triangle_index(eval_obj.data)
+
+        else:
+            self.loop_triangles[name] = get_loop_triangle_index(eval_obj.to_mesh())
+            eval_obj.to_mesh_clear()
+
+        self.tri_coords[name] = {}
+
+        self.log(f" Cached {name}'s {len(self.loop_triangles[name]['verts'])} evaluated loop triangles")
+
+    def get_bmesh(self, name, depsgraph):
+        '''
+        get the bmesh of a cached object, created from its evaluated mesh, when it's first requested
+        '''
+
+        if name not in self.bmeshes:
+            eval_obj = self.objects[name].evaluated_get(depsgraph)
+
+            # like for the loop triangles, read the evaluated mesh directly, objects outside the depsgraph, like hidden alternatives, fall back to their original mesh
+            bm = bmesh.new()
+
+            # from_object() only supports mesh objects, so curves, surfaces and text objects are converted to a temporary mesh first
+            if eval_obj.type == 'MESH':
+                bm.from_mesh(eval_obj.data)
+
+            else:
+                bm.from_mesh(eval_obj.to_mesh())
+                eval_obj.to_mesh_clear()
+
+            bm.verts.ensure_lookup_table()
+            bm.faces.ensure_lookup_table()
+            self.bmeshes[name] = bm
+
+            self.log(f" Created {name}'s snapping bmesh with {len(bm.faces)} faces and {len(bm.verts)} verts")
+
+        return self.bmeshes[name]
+
+    def get_tri_coords(self, name, index, mx):
+        '''
+        get the world space coords of the loop triangles of the face with the passed in index, 3 coords per triangle
+        the triangles are fetched from the loop triangle index, so this doesn't depend on the amount of faces in the mesh
+        '''
+
+        tri_index = self.loop_triangles[name]
+        start, end = tri_index['starts'][index:index + 2]
+
+        return [mx @ Vector(co) for co in tri_index['coords'][tri_index['verts'][start:end]].reshape(-1, 3)]
+
+    def clear(self):
         for name, bm in self.bmeshes.items():
             self.log(f" Freeing {name}'s temporary snapping bmesh")
             bm.free()
 
         self.objects.clear()
-        self.meshes.clear()
 
         self.bmeshes.clear()
 
         self.loop_triangles.clear()
         self.tri_coords.clear()
+
+
+def get_loop_triangle_index(mesh):
+    '''
+    index the loop triangles of the passed in mesh per face, using numpy
+    loop triangles are created in face order, so the triangles of face i are found at verts[starts[i]:starts[i + 1]]
+    '''
+
+    mesh.calc_loop_triangles()
+
+    tri_count = len(mesh.loop_triangles)
+
+    verts = np.empty(tri_count * 3, dtype=np.int32)
+    mesh.loop_triangles.foreach_get('vertices', verts)
+
+    faces = np.empty(tri_count, dtype=np.int32)
+    mesh.loop_triangles.foreach_get('polygon_index', faces)
+
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get('co', coords)
+
+    starts = np.zeros(len(mesh.polygons) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(faces, minlength=len(mesh.polygons)), out=starts[1:])
+
+    return {'verts': verts.reshape(-1, 3),
+            'starts': starts,
+            'coords': coords.reshape(-1, 3)}
+
+
+def refresh_snap_caches(depsgraph):
+    '''
+    refresh objects in the caches of running snapping modals, as soon as their geometry is updated
+    '''
+
+    for update in depsgraph.updates:
+        if update.is_updated_geometry and isinstance(update.id, bpy.types.Object):
+            obj = update.id.original
+
+            for cache in snap_caches:
+                cache.refresh(obj, depsgraph)
@@ -1,5 +1,7 @@
 import bpy
 import rna_keymap_ui
+import time
+from functools import wraps
 from mathutils import Vector
 from bpy_extras.view3d_utils import region_2d_to_location_3d, location_3d_to_region_2d
 from bl_ui.space_statusbar import STATUSBAR_HT_header as statusbar
@@ -280,3 +282,74 @@ def draw_basic_status(self, context, title):
 
 def finish_status(self):
     statusbar.draw = self.bar_orig
+
+
+# PIE STATE
+
+# set to True to print the draw time of the pies using pie_draw_timer
+debug = False
+
+# per pie state, computed once per pie invocation and reused for all redraws of that invocation
+pie_states = {}
+
+
+def get_pie_state_key(context):
+    '''
+    pies are usually invoked via wm.call_menu_pie, and there is no way to tell when a pie is opened or closed
+    so the state is tied to what it's usually derived from, should a pie be called directly, instead of via machin3.call_machin3tools_pie
+    '''
+
+    active = context.active_object
+    selected = tuple(sorted(obj.as_pointer() for obj in context.selected_objects))
+
+    return context.scene.as_pointer(), context.mode, selected, active.as_pointer() if active else None, len(bpy.data.collections)
+
+
+def get_pie_state(context, pie):
+    '''
+    return the pie's state snapshot, and only compute it via the pie's get_state() if there isn't a valid one yet
+    '''
+
+    key = get_pie_state_key(context)
+    state = pie_states.get(pie.bl_idname)
+
+    if state is None or state['key'] != key:
+        state = set_pie_state(context, pie)
+
+    return state
+
+
+def set_pie_state(context, pie):
+    state = pie.get_state(context)
+    state['key'] = get_pie_state_key(context)
+
+    pie_states[pie.bl_idname] = state
+    return state
+
+
+def clear_pie_states():
+    '''
+    forget all pie states, called on file load and undo, as pointers in the state keys can be reused then
+    '''
+
+    pie_states.clear()
+
+
+def pie_draw_timer(draw):
+    '''
+    decorator for pie menu draw methods, printing the time each draw takes, if debug is enabled
+    '''
+
+    @wraps(draw)
+    def timed_draw(self, context):
+        if debug:
+            start = time.perf_counter()
+
+            draw(self, context)
+
+            print(f"{self.bl_idname}: {(time.perf_counter() - start) * 1000:.3f}ms")
+
+        else:
+            draw(self, context)
+
+    return timed_draw
@@ -11,6 +11,28 @@ addon_abbr_mapping = {'MACHIN3tools': 'M3',
                       'HyperCursor': 'HC',
                       'PUNCHit': 'PI'}
 
+# the processed operators, along with the operator stack length, the last operator's pointer and properties, and the context mode they were processed for
+last_operators_cache = {'key': None, 'operators': []}
+
+
+def get_operator_properties_signature(op):
+    '''
+    return a comparable representation of an operator's properties, which change in place, when the operator is redone from the redo panel
+    '''
+
+    signature = []
+
+    for name, value in op.properties.items():
+        if hasattr(value, 'to_dict'):
+            value = value.to_dict()
+
+        elif hasattr(value, 'to_list'):
+            value = value.to_list()
+
+        signature.append((name, value))
+
+    return repr(signature)
+
 
 def get_last_operators(context, debug=False):
     def get_parent_addon(idname):
@@ -35,9 +57,18 @@ def get_last_operators(context, debug=False):
         if debug:
             printd(addons)
 
+    # the stack is only processed again, if an operator was added, removed or replaced, or if the last one's properties changed
+    # NOTE: a redo from the redo panel keeps the last operator, and only changes its properties, so they are part of the key too
+    wm_operators = context.window_manager.operators
+    last = wm_operators[-1] if wm_operators else None
+    key = (len(wm_operators), last.as_pointer() if last else None, get_operator_properties_signature(last) if last else None, context.mode)
+
+    if key == last_operators_cache['key']:
+        return last_operators_cache['operators']
+
     operators = []
 
-    for op in context.window_manager.operators:
+    for op in wm_operators:
         idname = op.bl_idname.replace('_OT_', '.').lower()
         label = op.bl_label.replace('MACHIN3: ', '').replace('Macro', '').strip()
         addon = get_parent_addon(idname)
@@ -256,4 +287,7 @@ def get_last_operators(context, debug=False):
         for addon, label, idname, prop in operators:
             print(addon, label, f"({idname})", prop)
 
+    last_operators_cache['key'] = key
+    last_operators_cache['operators'] = operators
+
     return operators